@@ -0,0 +1,54 @@
+"""
+Benchmark of plain and compressed inventory snapshots.
+
+Saves and loads a generated inventory in every supported format and prints the save time, load time and file size.
+The load time is measured with `load_inventory`, the path callers use; the `stream_inventory` time is shown alongside.
+Run from the repository root, e.g. `python benchmarks/bench_compression.py --items 100000 --level 6`.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from inventory_app.inventory import Inventory, InventoryLoader, InventorySerializer  # noqa: E402
+
+EXTENSIONS = [".json5", ".json5.gz", ".json5.bz2", ".json5.xz"]
+"""The formats to compare."""
+
+
+def _measure(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print the results as a table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000, help="number of items in the inventory")
+    parser.add_argument("--level", type=int, default=None, help="compression level, defaults to the default of each compression")
+    args = parser.parse_args()
+
+    inventory = Inventory(**{f"ingredient {i}": i * 0.25 + 1 for i in range(args.items)})
+
+    print(f"{'format':<12} {'save [s]':>10} {'load [s]':>10} {'stream [s]':>10} {'size [KiB]':>12} {'ratio':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        plain_size = None
+        for extension in EXTENSIONS:
+            path = os.path.join(directory, f"inventory{extension}")
+            loader = InventoryLoader(path, InventorySerializer(), compresslevel=args.level)
+
+            save = _measure(loader.save_inventory, inventory)
+            load = _measure(loader.load_inventory)
+            stream = _measure(loader.stream_inventory)
+            size = os.path.getsize(path)
+            plain_size = plain_size or size
+            print(f"{extension:<12} {save:>10.3f} {load:>10.3f} {stream:>10.3f} {size / 1024:>12.1f} {size / plain_size:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
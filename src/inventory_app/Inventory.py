@@ -9,14 +9,22 @@ Classes:
     - InventorySerializer: A class for serializing and deserializing an inventory.
     - LiveInventory: A live representation of a file that can be opened as an inventory.
     - InventoryLoader: A class for loading an inventory from a file.
+
+The serializer backends (json5, the streaming parser and the compression modules) are imported where they are used,
+so that importing this module stays cheap for callers that only work with inventories in memory.
 """
 
-from io import TextIOWrapper
+from bisect import bisect_left, insort
+from io import TextIOBase, TextIOWrapper
+from itertools import islice
+import json
 from numbers import Number
 import os
 from types import TracebackType
-from typing import Optional, Self, Type
-import json5
+from typing import Callable, Iterator, Optional, Self, Type
+
+_COMPRESSIONS = (".gz", ".bz2", ".xz")
+"""The file extensions of the supported compressions."""
 
 
 class InvalidFileFormat(Exception):
@@ -38,11 +46,28 @@ class Inventory:
         items(self): Returns an iterator over the items in the inventory.
         keys(self): Returns an iterator over names of items in the inventory.
         save(self, path: str): Saves the inventory to a file.
+        set_threshold(self, item: str, threshold: Optional[float]): Sets the reorder threshold of an item.
+        below_threshold(self): Returns the names of all items below their threshold.
+        scarcest(self, k: int): Returns the names of the k items closest to or furthest below their threshold.
+        on_threshold(self, callback): Registers a callback for items crossing their threshold.
+        observe(self, callback): Registers a callback for every change of an item quantity.
     """
 
     __inventory: dict[str, float]
     """The dictionary representing the inventory, where the keys are item names and the values are quantities."""
 
+    __thresholds: dict[str, float]
+    """The reorder thresholds of the items, where the keys are item names and the values are the thresholds."""
+
+    __margins: list[tuple[float, str]]
+    """The sorted index of (quantity - threshold, item) for every item with a threshold."""
+
+    __threshold_callbacks: list[Callable[[str, float, bool], None]]
+    """The callbacks to notify when an item crosses its threshold."""
+
+    __observers: list[Callable[[str, float, float], None]]
+    """The callbacks to notify when the quantity of an item changes."""
+
     def __init__(self, **items: float):
         """
         Initialize the Inventory object.
@@ -51,6 +76,10 @@ class Inventory:
             **items (float): The items to initialize the inventory with.
         """
         self.__inventory = items
+        self.__thresholds = {}
+        self.__margins = []
+        self.__threshold_callbacks = []
+        self.__observers = []
 
     def __len__(self):
         return len(self.__inventory)
@@ -62,7 +91,9 @@ class Inventory:
         if quantity <= 0:
             self.remove(item)
         else:
+            previous = self[item]
             self.__inventory[item] = quantity
+            self.__changed(item, previous)
 
     def __delitem__(self, item: str):
         self.remove(item)
@@ -90,10 +121,14 @@ class Inventory:
 
         if quantity < 0:
             self.remove(item, -quantity)
-        elif item not in self.__inventory:
+            return
+
+        previous = self[item]
+        if item not in self.__inventory:
             self.__inventory[item] = quantity
         else:
             self.__inventory[item] += quantity
+        self.__changed(item, previous)
 
     def remove(self, item: str, quantity: Optional[float] = None):
         """Remove the given quantity of an item from the inventory.
@@ -115,6 +150,7 @@ class Inventory:
             del self.__inventory[item]
         else:
             self.__inventory[item] -= quantity
+        self.__changed(item, stored)
 
     def items(self):
         """Return an iterator over the items in the inventory."""
@@ -124,6 +160,95 @@ class Inventory:
         """Return an iterator over the item names in the inventory."""
         return self.__inventory.keys()
 
+    def set_threshold(self, item: str, threshold: Optional[float]):
+        """Set the reorder threshold of an item.
+
+        An item is below its threshold if its quantity is strictly less than the threshold.
+        Setting a threshold does not notify the threshold callbacks.
+
+        Arguments:
+            item (str): The name of the item.
+            threshold (float, optional): The reorder threshold. None removes the threshold.
+        """
+        if item in self.__thresholds:
+            self.__unindex(self.__margin(item), item)
+            del self.__thresholds[item]
+        if threshold is not None:
+            self.__thresholds[item] = threshold
+            insort(self.__margins, (self.__margin(item), item))
+
+    def threshold(self, item: str) -> Optional[float]:
+        """Return the reorder threshold of an item, or None if it has none."""
+        return self.__thresholds.get(item)
+
+    def below_threshold(self) -> list[str]:
+        """Return the names of all items below their threshold, scarcest first."""
+        end = bisect_left(self.__margins, (0,))
+        return [item for _, item in self.__margins[:end]]
+
+    def scarcest(self, k: int) -> list[str]:
+        """Return the names of the k items with the smallest quantity relative to their threshold.
+
+        Arguments:
+            k (int): The maximum number of items to return.
+        """
+        return [item for _, item in islice(self.__margins, k)]
+
+    def on_threshold(self, callback: Callable[[str, float, bool], None]):
+        """Register a callback for items crossing their threshold.
+
+        The callback is called with the item name, its new quantity and whether it is now below its threshold.
+        It is only called when an item falls below or rises back to its threshold, not on every change.
+
+        Arguments:
+            callback (Callable[[str, float, bool], None]): The callback to register.
+        """
+        self.__threshold_callbacks.append(callback)
+
+    def observe(self, callback: Callable[[str, float, float], None]):
+        """Register a callback for every change of an item quantity.
+
+        The callback is called with the item name, its previous quantity and its new quantity.
+
+        Arguments:
+            callback (Callable[[str, float, float], None]): The callback to register.
+        """
+        self.__observers.append(callback)
+
+    def unobserve(self, callback: Callable[[str, float, float], None]):
+        """Unregister a callback registered with `observe`.
+
+        Arguments:
+            callback (Callable[[str, float, float], None]): The callback to unregister.
+        """
+        self.__observers.remove(callback)
+
+    def __margin(self, item: str) -> float:
+        return self[item] - self.__thresholds[item]
+
+    def __unindex(self, margin: float, item: str):
+        index = bisect_left(self.__margins, (margin, item))
+        if index == len(self.__margins) or self.__margins[index] != (margin, item):
+            raise RuntimeError(f"Low-stock index has no entry for item '{item}' with margin {margin}")
+        del self.__margins[index]
+
+    def __changed(self, item: str, previous: float):
+        # The index is updated before any callback runs, since callbacks may change the inventory again.
+        quantity = self[item]
+        crossed = False
+        if item in self.__thresholds:
+            old_margin = previous - self.__thresholds[item]
+            new_margin = quantity - self.__thresholds[item]
+            self.__unindex(old_margin, item)
+            insort(self.__margins, (new_margin, item))
+            crossed = (old_margin < 0) != (new_margin < 0)
+
+        if crossed:
+            for callback in self.__threshold_callbacks:
+                callback(item, quantity, new_margin < 0)
+        for observer in self.__observers:
+            observer(item, previous, quantity)
+
 
 class InventorySerializer:
     """A class for serializing and deserializing an inventory."""
@@ -134,11 +259,26 @@ class InventorySerializer:
 
     def deserialize(self, file: TextIOWrapper) -> dict[str, float]:
         """Deserialize an inventory from a file."""
+        import json5
+
         try:
             return json5.load(file)
         except Exception as e:
             raise InvalidFileFormat(f"File '{file.path}' could not be loaded as json5") from e
 
+    def dump(self, inventory: Inventory, file: TextIOBase):
+        """Serialize an inventory to a file item by item, without building the whole text in memory."""
+        file.write("{")
+        for index, (item, quantity) in enumerate(self.serialize(inventory).items()):
+            file.write(f"{', ' if index else ''}{json.dumps(item)}: {json.dumps(quantity)}")
+        file.write("}")
+
+    def iter_items(self, file: TextIOWrapper) -> Iterator[tuple[str, float]]:
+        """Deserialize an inventory from a file incrementally, validating each item as it is read."""
+        from inventory_app.streaming import InventoryStreamParser
+
+        return iter(InventoryStreamParser(file))
+
 
 class InventoryLoader:
     """
@@ -154,23 +294,36 @@ class InventoryLoader:
     __serializer: InventorySerializer
     """The serializer to use."""
 
-    def __init__(self, path: str, serializer: InventorySerializer):
+    __compresslevel: Optional[int]
+    """The compression level for compressed files, or None for the default of the compression."""
+
+    def __init__(self, path: str, serializer: InventorySerializer, compresslevel: Optional[int] = None):
         """
         Initialize the InventoryLoader.
 
+        Files ending in `.gz`, `.bz2` or `.xz` after the json suffix, e.g. `inventory.json5.gz`, are compressed.
+        They are compressed and decompressed while streaming through the serializer.
+
         Arguments:
             path (str): The path to the inventory file.
+            compresslevel (int, optional): The compression level for compressed files. Defaults to the default of the compression.
         """
         self.__path = InventoryLoader._fullpath(path)
         self.__serializer = serializer
+        self.__compresslevel = compresslevel
 
     def load_inventory(self) -> Inventory:
         """
         Load the inventory from the file and return an Inventory object.
 
+        Compressed files are decompressed and parsed incrementally, with the same result as the plain file.
+
         Returns:
             Inventory: The loaded inventory.
         """
+        if self.__compression() is not None:
+            return Inventory(**dict(self.__stream_items()))
+
         try:
             with open(self.__path, 'r', encoding="utf-8") as file:
                 inventory = self.__serializer.deserialize(file)
@@ -179,6 +332,51 @@ class InventoryLoader:
         except FileNotFoundError:
             return Inventory()
 
+    def stream_inventory(self, inventory: Optional[Inventory] = None) -> Inventory:
+        """
+        Load the inventory from the file incrementally.
+
+        Each item is validated and inserted as soon as it is read, so the file is never held in memory as a whole.
+        On the first invalid item an `InvalidFileFormat` is raised and the items read so far remain in the inventory.
+
+        Arguments:
+            inventory (Inventory, optional): The inventory to insert the items into. Defaults to a new inventory.
+
+        Returns:
+            Inventory: The inventory the items were inserted into.
+        """
+        if inventory is None:
+            inventory = Inventory()
+        for item, quantity in self.__stream_items():
+            inventory[item] = quantity
+        return inventory
+
+    def iter_chunks(self, size: int) -> Iterator[dict[str, float]]:
+        """
+        Load the inventory from the file incrementally in chunks of items.
+
+        Arguments:
+            size (int): The maximum number of items per chunk.
+
+        Returns:
+            Iterator[dict[str, float]]: The validated items, chunk by chunk. Nothing is yielded if the file does not exist.
+        """
+        items = self.__stream_items()
+        while chunk := dict(islice(items, size)):
+            yield chunk
+
+    def __stream_items(self) -> Iterator[tuple[str, float]]:
+        try:
+            file = self.__open('r')
+        except FileNotFoundError:
+            return
+
+        with file:
+            try:
+                yield from self.__serializer.iter_items(file)
+            except self.__decompression_errors() as e:
+                raise InvalidFileFormat(f"File '{self.__path}' could not be decompressed") from e
+
     def save_inventory(self, inventory: Inventory):
         """Save the inventory to a file.
 
@@ -186,13 +384,44 @@ class InventoryLoader:
             inventory (Inventory): The inventory to save.
         """
         os.makedirs(os.path.dirname(self.__path), exist_ok=True)
-        with open(self.__path, 'w', encoding="utf-8") as file:
-            content = self.__serializer.serialize(inventory)
-            json5.dump(content, file)
+        with self.__open('w') as file:
+            self.__serializer.dump(inventory, file)
+
+    def __compression(self) -> Optional[str]:
+        extension = os.path.splitext(self.__path)[1]
+        return extension[1:] if extension in _COMPRESSIONS else None
+
+    def __decompression_errors(self) -> tuple[Type[Exception], ...]:
+        compression = self.__compression()
+        if compression is None:
+            return ()
+        if compression == "xz":
+            import lzma
+
+            return (OSError, EOFError, lzma.LZMAError)
+        return (OSError, EOFError)
+
+    def __open(self, mode: str) -> TextIOBase:
+        compression = self.__compression()
+        if compression is None:
+            return open(self.__path, mode, encoding="utf-8", newline="")
+
+        if compression == "xz":
+            import lzma
+
+            preset = None if mode == 'r' else self.__compresslevel
+            return lzma.open(self.__path, mode + 't', preset=preset, encoding="utf-8", newline="")
+        if compression == "gz":
+            import gzip as module
+        else:
+            import bz2 as module
+
+        level = 9 if self.__compresslevel is None else self.__compresslevel
+        return module.open(self.__path, mode + 't', compresslevel=level, encoding="utf-8", newline="")
 
     @staticmethod
     def _fullpath(path: str):
-        if not path.endswith((".json", ".json5")):
+        if not path.endswith(tuple(f".json{version}{compression}" for version in ("", "5") for compression in ("", *_COMPRESSIONS))):
             path += ".json5"
         return path
 
@@ -1,3 +1,19 @@
 """
 This module contains the inventory_app package.
+
+Submodules are imported lazily on first attribute access, so `import inventory_app` stays cheap for short-lived processes.
 """
+
+import importlib
+
+_SUBMODULES = {"inventory", "cooking_service", "recipe", "streaming", "pooled_inventory", "substitution", "shared_inventory", "reservation"}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
@@ -4,8 +4,12 @@ Cooking service API.
 This module contains the CookingService class, which is a service for checking and cooking recipes based on available inventory.
 """
 
+from typing import Optional
+
 from inventory_app.inventory import Inventory
 from inventory_app.recipe import Recipe
+from inventory_app.reservation import ReservationBook
+from inventory_app.substitution import SubstitutionCatalog
 
 
 class CookingException(Exception):
@@ -18,14 +22,24 @@ class CookingService:
     inventory: Inventory
     """The inventory to use for cooking."""
 
-    def __init__(self, inventory: Inventory):
+    substitutions: Optional[SubstitutionCatalog]
+    """The substitution rules to use for missing ingredients."""
+
+    reservations: Optional[ReservationBook]
+    """The reservations holding ingredients of the inventory back for pending orders."""
+
+    def __init__(self, inventory: Inventory, substitutions: Optional[SubstitutionCatalog] = None, reservations: Optional[ReservationBook] = None):
         """
         Initialize a CookingService object.
 
         Arguments:
             inventory (Inventory): The inventory to use for cooking.
+            substitutions (SubstitutionCatalog, optional): The substitution rules to use for missing ingredients. Defaults to None.
+            reservations (ReservationBook, optional): The reservations on the inventory. Reserved quantities are not used for cooking. Defaults to None.
         """
         self.inventory = inventory
+        self.substitutions = substitutions
+        self.reservations = reservations
 
     def is_cookable(self, recipe: Recipe):
         """
@@ -33,6 +47,9 @@ class CookingService:
 
         This method checks if the provided recipe can be prepared based on the available inventory.
         It iterates through each ingredient in the recipe and checks if the quantity is sufficient.
+        Missing quantities are covered by substitutes, cheapest first, if substitution rules are given.
+        Substitutes only use stock that is not needed by the recipe's own ingredients.
+        Quantities held by reservations are not available.
 
         Arguments:
             recipe (Recipe): The recipe to be checked.
@@ -41,10 +58,42 @@ class CookingService:
         Returns:
             bool: True if the recipe can be prepared, False otherwise.
         """
+        return self.plan_recipe(recipe) is not None
+
+    def plan_recipe(self, recipe: Recipe) -> Optional[dict[str, float]]:
+        """
+        Resolve the quantities to take from the inventory for the given recipe.
+
+        Arguments:
+            recipe (Recipe): The recipe to be planned.
+
+        Returns:
+            dict[str, float] | None: The quantities of the inventory items to use, or None if the recipe cannot be prepared.
+        """
+        # Every ingredient takes its own stock first, so substitutes never claim stock another ingredient needs.
+        plan: dict[str, float] = {}
+        missing: dict[str, float] = {}
         for ingredient, quantity in recipe.ingredients.items():
-            if ingredient not in self.inventory or self.inventory[ingredient] < quantity:
-                return False
-        return True
+            taken = min(quantity, self.__available(ingredient))
+            if taken > 0:
+                plan[ingredient] = taken
+            if taken < quantity:
+                missing[ingredient] = quantity - taken
+
+        for ingredient, quantity in missing.items():
+            for candidate, ratio in self.__substitutes(ingredient):
+                available = self.__available(candidate) - plan.get(candidate, 0)
+                if available <= 0:
+                    continue
+                needed = quantity * ratio
+                if needed <= available:
+                    plan[candidate] = plan.get(candidate, 0) + needed
+                    break
+                plan[candidate] = plan.get(candidate, 0) + available
+                quantity -= available / ratio
+            else:
+                return None
+        return plan
 
     def cook_recipe(self, recipe: Recipe):
         """
@@ -59,8 +108,56 @@ class CookingService:
         Raises:
             CookingException: If there are not enough ingredients to cook the recipe.
         """
-        if not self.is_cookable(recipe):
+        plan = self.plan_recipe(recipe)
+        if plan is None:
             raise CookingException("Not enough ingredients to cook the recipe")
 
-        for ingredient, quantity in recipe.ingredients.items():
-            self.inventory[ingredient] -= quantity
+        for ingredient, quantity in plan.items():
+            self.inventory.remove(ingredient, quantity)
+
+    def reserve_recipe(self, recipe: Recipe, ttl: float) -> int:
+        """
+        Reserve the ingredients of a recipe for a pending order.
+
+        Arguments:
+            recipe (Recipe): The recipe to be reserved.
+            ttl (float): The time in seconds after which the reservation expires.
+
+        Returns:
+            int: The id of the reservation, to be cooked with `cook_reservation` or released by the reservations.
+
+        Raises:
+            CookingException: If there is no reservation book or there are not enough ingredients to cook the recipe.
+        """
+        if self.reservations is None:
+            raise CookingException("No reservations to reserve the recipe in")
+
+        plan = self.plan_recipe(recipe)
+        if plan is None:
+            raise CookingException("Not enough ingredients to cook the recipe")
+        return self.reservations.hold(plan, ttl)
+
+    def cook_reservation(self, reservation: int):
+        """
+        Cook a previously reserved recipe, using the reserved ingredients.
+
+        Arguments:
+            reservation (int): The id of the reservation.
+
+        Raises:
+            CookingException: If there is no reservation book.
+            ReservationError: If the reservation is unknown or expired, or its ingredients are not on hand anymore.
+        """
+        if self.reservations is None:
+            raise CookingException("No reservations to cook the recipe from")
+        self.reservations.commit(reservation)
+
+    def __available(self, item: str) -> float:
+        if self.reservations is None:
+            return self.inventory[item]
+        return self.reservations.available(item)
+
+    def __substitutes(self, ingredient: str) -> list[tuple[str, float]]:
+        if self.substitutions is None:
+            return []
+        return self.substitutions.substitutes(ingredient)
@@ -0,0 +1,200 @@
+"""
+Pooled inventory API.
+
+This module provides a read view over the inventories of several locations, which can be used by the CookingService to
+cook from the pooled stock of all locations.
+
+Classes:
+    - PooledInventory: The union of several inventories with incrementally maintained totals.
+
+Functions:
+    - nearest_first: Allocation policy taking from the locations in the given order.
+    - drain_smallest: Allocation policy taking from the locations with the smallest stock first.
+    - balanced: Allocation policy taking from every location in proportion to its stock.
+"""
+
+from types import TracebackType
+from typing import Callable, Optional, Self, Type
+
+from inventory_app.inventory import Inventory
+
+AllocationPolicy = Callable[[float, list[tuple[str, float]]], list[tuple[str, float]]]
+"""
+A policy splitting a quantity across locations.
+
+It is called with the quantity to take and the (location, stock) pairs of all locations holding the item, in location
+order, and returns the (location, quantity) pairs to take. The quantity never exceeds the total stock.
+"""
+
+
+def _take_in_order(quantity: float, stocks: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    allocation = []
+    for location, stock in stocks:
+        if quantity <= 0:
+            break
+        taken = min(stock, quantity)
+        allocation.append((location, taken))
+        quantity -= taken
+    return allocation
+
+
+def nearest_first(quantity: float, stocks: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    """Take from the locations in the order they were given to the PooledInventory, i.e. nearest first."""
+    return _take_in_order(quantity, stocks)
+
+
+def drain_smallest(quantity: float, stocks: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    """Take from the locations with the smallest stock first, emptying as many locations as possible."""
+    return _take_in_order(quantity, sorted(stocks, key=lambda stock: stock[1]))
+
+
+def balanced(quantity: float, stocks: list[tuple[str, float]]) -> list[tuple[str, float]]:
+    """Take from every location in proportion to its stock, so all locations keep the same share."""
+    total = sum(stock for _, stock in stocks)
+    allocation = [(location, quantity * stock / total) for location, stock in stocks[:-1]]
+    location, stock = stocks[-1]
+    allocation.append((location, min(stock, quantity - sum(taken for _, taken in allocation))))
+    return allocation
+
+
+class PooledInventory:
+    """
+    The union of the inventories of several locations.
+
+    The total quantity of every item is maintained incrementally by observing the location inventories, so reading the
+    pooled stock never iterates the locations. Removing items splits the quantity across the locations according to
+    the allocation policy, adding items puts them into the first location.
+
+    A PooledInventory can be used in place of an Inventory for the CookingService.
+    """
+
+    __locations: dict[str, Inventory]
+    """The inventories of the locations, in allocation order."""
+
+    __policy: AllocationPolicy
+    """The policy splitting removed quantities across the locations."""
+
+    __totals: dict[str, float]
+    """The total quantity of every item over all locations."""
+
+    __holders: dict[str, int]
+    """The number of locations holding each item."""
+
+    def __init__(self, locations: dict[str, Inventory], policy: AllocationPolicy = nearest_first):
+        """
+        Initialize the PooledInventory.
+
+        Arguments:
+            locations (dict[str, Inventory]): The inventories of the locations by name, nearest first.
+            policy (AllocationPolicy, optional): The policy splitting removed quantities across the locations. Defaults to nearest_first.
+        """
+        self.__locations = dict(locations)
+        self.__policy = policy
+        self.__totals = {}
+        self.__holders = {}
+        for inventory in self.__locations.values():
+            for item, quantity in inventory.items():
+                self.__changed(item, 0, quantity)
+            inventory.observe(self.__changed)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ):
+        self.close()
+
+    def __len__(self):
+        return len(self.__totals)
+
+    def __getitem__(self, item: str):
+        return self.__totals.get(item, 0)
+
+    def __setitem__(self, item: str, quantity: float):
+        self.add(item, quantity - self[item])
+
+    def __delitem__(self, item: str):
+        self.remove(item)
+
+    def __contains__(self, item: str):
+        return item in self.__totals
+
+    def __eq__(self, other: Self | dict[str, float]):
+        if isinstance(other, dict):
+            return self.__totals == other
+        elif isinstance(other, PooledInventory):
+            return self.__totals == other.__totals
+        else:
+            return NotImplemented
+
+    def location(self, name: str) -> Inventory:
+        """Return the inventory of the given location."""
+        return self.__locations[name]
+
+    def locations(self):
+        """Return an iterator over the location names."""
+        return self.__locations.keys()
+
+    def add(self, item: str, quantity: float = 1):
+        """Add the given quantity of an item to the first location.
+
+        Arguments:
+            item (str): The name of the item to add.
+            quantity (float, optional): The quantity of the item to add. Defaults to 1.
+        """
+        if quantity < 0:
+            self.remove(item, -quantity)
+        elif quantity > 0:
+            next(iter(self.__locations.values())).add(item, quantity)
+
+    def remove(self, item: str, quantity: Optional[float] = None):
+        """Remove the given quantity of an item, split across the locations by the allocation policy.
+
+        If the quantity is not given, the item is removed from all locations.
+
+        Arguments:
+            item (str): The name of the item to remove.
+            quantity (float, optional): The quantity of the item to remove. Defaults to None.
+        """
+        if quantity is not None and quantity < 0:
+            self.add(item, -quantity)
+            return
+        if item not in self.__totals:
+            return
+
+        stocks = [(name, inventory[item]) for name, inventory in self.__locations.items() if item in inventory]
+        if quantity is None or quantity >= self.__totals[item]:
+            allocation = stocks
+        else:
+            allocation = self.__policy(quantity, stocks)
+
+        for name, taken in allocation:
+            self.__locations[name].remove(item, taken)
+
+    def items(self):
+        """Return an iterator over the pooled items."""
+        return self.__totals.items()
+
+    def names(self):
+        """Return an iterator over the pooled item names."""
+        return self.__totals.keys()
+
+    def close(self):
+        """Stop observing the location inventories."""
+        for inventory in self.__locations.values():
+            inventory.unobserve(self.__changed)
+
+    def __changed(self, item: str, previous: float, quantity: float):
+        previous, quantity = max(previous, 0), max(quantity, 0)
+        holders = self.__holders.get(item, 0) - (previous > 0) + (quantity > 0)
+
+        if holders == 0:
+            self.__holders.pop(item, None)
+            self.__totals.pop(item, None)
+        else:
+            self.__holders[item] = holders
+            self.__totals[item] = self.__totals.get(item, 0) + quantity - previous
@@ -0,0 +1,188 @@
+"""
+Reservation API.
+
+This module contains the ReservationBook class, which holds ingredients of pending orders back from other orders.
+
+Classes:
+    - ReservationError: An error that occurs when using an unknown or expired reservation.
+    - ReservationBook: A book of expiring holds on the items of an inventory.
+"""
+
+from heapq import heapify, heappop, heappush
+from itertools import count
+import time
+from typing import Callable, Mapping
+
+from inventory_app.inventory import Inventory
+
+
+class ReservationError(Exception):
+    """A reservation is unknown, expired or cannot be satisfied."""
+
+
+class ReservationBook:
+    """
+    A book of expiring holds on the items of an inventory.
+
+    A hold reduces the quantity available to promise without reducing the quantity on hand. It is either committed,
+    which removes its quantities from the inventory, released, or it expires after its time to live.
+
+    Expired holds are dropped lazily from a heap ordered by deadline, so expiry only touches the expired holds.
+    """
+
+    __inventory: Inventory
+    """The inventory the holds are placed on."""
+
+    __clock: Callable[[], float]
+    """The clock measuring the deadlines in seconds."""
+
+    __holds: dict[int, tuple[dict[str, float], float]]
+    """The quantities and the deadline of every active hold."""
+
+    __reserved: dict[str, float]
+    """The total reserved quantity of every item."""
+
+    __holders: dict[str, int]
+    """The number of active holds on each item."""
+
+    __deadlines: list[tuple[float, int]]
+    """The heap of (deadline, hold id), possibly containing holds that were already committed or released."""
+
+    __ids: count
+    """The generator of hold ids."""
+
+    def __init__(self, inventory: Inventory, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a ReservationBook.
+
+        Arguments:
+            inventory (Inventory): The inventory the holds are placed on.
+            clock (Callable[[], float], optional): The clock measuring the deadlines in seconds. Defaults to time.monotonic.
+        """
+        self.__inventory = inventory
+        self.__clock = clock
+        self.__holds = {}
+        self.__reserved = {}
+        self.__holders = {}
+        self.__deadlines = []
+        self.__ids = count(1)
+
+    def __len__(self):
+        self.expire()
+        return len(self.__holds)
+
+    def __contains__(self, hold: int):
+        self.expire()
+        return hold in self.__holds
+
+    def reserved(self, item: str) -> float:
+        """Return the quantity of an item held by active reservations."""
+        self.expire()
+        return self.__reserved.get(item, 0)
+
+    def available(self, item: str) -> float:
+        """Return the quantity of an item on hand and not held by active reservations."""
+        return max(0, self.__inventory[item] - self.reserved(item))
+
+    def hold(self, quantities: Mapping[str, float], ttl: float) -> int:
+        """
+        Hold quantities of items back for a pending order.
+
+        Arguments:
+            quantities (Mapping[str, float]): The quantities of the items to hold.
+            ttl (float): The time in seconds after which the hold expires.
+
+        Returns:
+            int: The id of the hold.
+
+        Raises:
+            ReservationError: If a quantity is not positive or an item is not available in the requested quantity.
+        """
+        for item, quantity in quantities.items():
+            if quantity <= 0:
+                raise ReservationError(f"Quantity {quantity} of '{item}' to reserve is not positive")
+            if self.available(item) < quantity:
+                raise ReservationError(f"Not enough '{item}' available to reserve {quantity}")
+
+        hold = next(self.__ids)
+        deadline = self.__clock() + ttl
+        self.__holds[hold] = (dict(quantities), deadline)
+        heappush(self.__deadlines, (deadline, hold))
+        for item, quantity in quantities.items():
+            self.__reserved[item] = self.__reserved.get(item, 0) + quantity
+            self.__holders[item] = self.__holders.get(item, 0) + 1
+        return hold
+
+    def commit(self, hold: int):
+        """
+        Remove the quantities of a hold from the inventory and drop the hold.
+
+        If the inventory no longer holds every quantity, e.g. because it was used without a reservation, nothing is
+        removed and the hold stays active.
+
+        Arguments:
+            hold (int): The id of the hold.
+
+        Raises:
+            ReservationError: If the hold is unknown or expired, or an item is not on hand in the held quantity.
+        """
+        for item, quantity in self.__quantities(hold).items():
+            if self.__inventory[item] < quantity:
+                raise ReservationError(f"Only {self.__inventory[item]} '{item}' on hand to commit {quantity} for reservation {hold}")
+
+        for item, quantity in self.__drop(hold).items():
+            self.__inventory.remove(item, quantity)
+
+    def release(self, hold: int):
+        """
+        Drop a hold without changing the inventory.
+
+        Arguments:
+            hold (int): The id of the hold.
+
+        Raises:
+            ReservationError: If the hold is unknown or expired.
+        """
+        self.__drop(hold)
+
+    def expire(self) -> list[int]:
+        """
+        Drop all holds whose deadline has passed.
+
+        Returns:
+            list[int]: The ids of the expired holds.
+        """
+        now = self.__clock()
+        expired = []
+        while self.__deadlines and self.__deadlines[0][0] <= now:
+            _, hold = heappop(self.__deadlines)
+            if hold in self.__holds:
+                self.__unhold(hold)
+                expired.append(hold)
+        return expired
+
+    def __quantities(self, hold: int) -> dict[str, float]:
+        self.expire()
+        if hold not in self.__holds:
+            raise ReservationError(f"Reservation {hold} is unknown or expired")
+        return self.__holds[hold][0]
+
+    def __drop(self, hold: int) -> dict[str, float]:
+        self.__quantities(hold)
+        quantities = self.__unhold(hold)
+        # Committed and released holds stay in the heap until their deadline, unless they make up most of it.
+        if len(self.__deadlines) > 2 * len(self.__holds) + 64:
+            self.__deadlines = [(deadline, hold) for hold, (_, deadline) in self.__holds.items()]
+            heapify(self.__deadlines)
+        return quantities
+
+    def __unhold(self, hold: int) -> dict[str, float]:
+        quantities, _ = self.__holds.pop(hold)
+        for item, quantity in quantities.items():
+            self.__holders[item] -= 1
+            if self.__holders[item] == 0:
+                del self.__holders[item]
+                del self.__reserved[item]
+            else:
+                self.__reserved[item] -= quantity
+        return quantities
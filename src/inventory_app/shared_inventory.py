@@ -0,0 +1,314 @@
+"""
+Shared inventory API.
+
+This module provides an inventory stored in shared memory, so that all processes on one host work on the same items
+without a file round-trip.
+
+Classes:
+    - InventoryCapacityError: An error that occurs when a shared inventory has no free slot for a new item.
+    - SharedInventory: An inventory backed by `multiprocessing.shared_memory`.
+"""
+
+from contextlib import ExitStack, contextmanager
+import multiprocessing
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import RLock
+import os
+import threading
+from types import TracebackType
+from typing import Optional, Self, Type
+
+from inventory_app.inventory import Inventory, InventoryLoader
+
+NAME_SIZE = 64
+"""The maximum length of an item name in bytes, utf-8 encoded."""
+
+_HEADER_SIZE = 8
+"""The size of the header holding the number of used slots."""
+
+
+class InventoryCapacityError(Exception):
+    """A shared inventory has no free slot for a new item."""
+
+
+class SharedInventory:
+    """
+    An inventory backed by shared memory.
+
+    The memory holds a fixed table of item names and an array of float64 quantities, one slot per item. Slots are
+    assigned on first use and never reused, so removed items keep their slot with a quantity of zero. Reads are
+    zero-copy and updates are visible to all attached processes immediately.
+
+    Every slot is guarded by one of a fixed set of striped locks. `add`, `remove` and assignments are atomic per item;
+    use `transaction` to make a sequence of operations atomic, e.g. checking and cooking a recipe.
+
+    Other processes attach by receiving the SharedInventory as an argument when they are created, e.g. as `args` of a
+    `multiprocessing.Process` or `initargs` of a `multiprocessing.Pool`, since the locks can only be shared by inheritance.
+    The creating process owns the memory and releases it when leaving the context, or explicitly with `unlink`.
+    """
+
+    __memory: SharedMemory
+    """The shared memory holding the header, the name table and the quantities."""
+
+    __capacity: int
+    """The number of slots."""
+
+    __count: memoryview
+    """The number of used slots."""
+
+    __names: memoryview
+    """The name table, NAME_SIZE zero-padded bytes per slot."""
+
+    __quantities: memoryview
+    """The float64 quantities, one per slot."""
+
+    __table_lock: RLock
+    """The lock guarding the assignment of new slots."""
+
+    __locks: list[RLock]
+    """The striped locks guarding the quantities."""
+
+    __owner: Optional[int]
+    """The process id of the process that created the shared memory, if known."""
+
+    __slots: dict[str, int]
+    """The slots of the item names known to this process."""
+
+    __snapshots: Optional[tuple[threading.Event, threading.Thread]]
+    """The event stopping the periodic snapshots and their thread, if running."""
+
+    def __init__(self, capacity: int = 1024, stripes: int = 16, context: Optional[BaseContext] = None):
+        """
+        Create a new, empty SharedInventory.
+
+        Arguments:
+            capacity (int, optional): The maximum number of distinct items. Defaults to 1024.
+            stripes (int, optional): The number of locks the slots are striped across. Defaults to 16.
+            context (BaseContext, optional): The multiprocessing context of the processes to share with. Defaults to the default context.
+        """
+        context = context or multiprocessing.get_context()
+        self.__capacity = capacity
+        self.__table_lock = context.RLock()
+        self.__locks = [context.RLock() for _ in range(stripes)]
+        self.__owner = os.getpid()
+        self.__attach(SharedMemory(create=True, size=_HEADER_SIZE + capacity * (NAME_SIZE + 8)))
+
+    @classmethod
+    def from_inventory(cls, inventory: Inventory, capacity: Optional[int] = None, stripes: int = 16, context: Optional[BaseContext] = None) -> Self:
+        """
+        Create a new SharedInventory holding the items of an inventory.
+
+        Arguments:
+            inventory (Inventory): The inventory to copy, e.g. loaded by an InventoryLoader.
+            capacity (int, optional): The maximum number of distinct items. Defaults to twice the items of the inventory, at least 1024.
+            stripes (int, optional): The number of locks the slots are striped across. Defaults to 16.
+            context (BaseContext, optional): The multiprocessing context of the processes to share with. Defaults to the default context.
+        """
+        shared = cls(capacity or max(1024, 2 * len(inventory)), stripes, context)
+        for item, quantity in inventory.items():
+            shared[item] = quantity
+        return shared
+
+    def __getstate__(self):
+        return {"name": self.__memory.name, "capacity": self.__capacity, "table_lock": self.__table_lock, "locks": self.__locks}
+
+    def __setstate__(self, state: dict):
+        self.__capacity = state["capacity"]
+        self.__table_lock = state["table_lock"]
+        self.__locks = state["locks"]
+        self.__owner = None
+        self.__attach(SharedMemory(name=state["name"]))
+
+    def __attach(self, memory: SharedMemory):
+        self.__memory = memory
+        names_end = _HEADER_SIZE + self.__capacity * NAME_SIZE
+        self.__count = memory.buf[:_HEADER_SIZE].cast("q")
+        self.__names = memory.buf[_HEADER_SIZE:names_end]
+        self.__quantities = memory.buf[names_end:names_end + self.__capacity * 8].cast("d")
+        self.__slots = {}
+        self.__snapshots = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ):
+        self.close()
+        if self.__owner == os.getpid():
+            self.unlink()
+
+    def __len__(self):
+        return sum(1 for slot in range(self.__count[0]) if self.__quantities[slot] > 0)
+
+    def __getitem__(self, item: str):
+        slot = self.__slot(item)
+        return 0 if slot is None else self.__quantities[slot]
+
+    def __setitem__(self, item: str, quantity: float):
+        if quantity <= 0:
+            self.remove(item)
+            return
+        slot = self.__slot(item, create=True)
+        with self.__lock(slot):
+            self.__quantities[slot] = quantity
+
+    def __delitem__(self, item: str):
+        self.remove(item)
+
+    def __contains__(self, item: str):
+        return self[item] > 0
+
+    def __eq__(self, other: Self | Inventory | dict[str, float]):
+        if isinstance(other, (dict, Inventory)):
+            return other == dict(self.items())
+        elif isinstance(other, SharedInventory):
+            return dict(self.items()) == dict(other.items())
+        else:
+            return NotImplemented
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block."""
+        return self.__memory.name
+
+    def add(self, item: str, quantity: float = 1):
+        """Add the given quantity of an item to the inventory.
+
+        Arguments:
+            item (str): The name of the item to add.
+            quantity (float, optional): The quantity of the item to add. Defaults to 1.
+
+        Raises:
+            InventoryCapacityError: If the item is new and all slots are in use.
+        """
+        if quantity == 0:
+            return
+        if quantity < 0:
+            self.remove(item, -quantity)
+            return
+
+        slot = self.__slot(item, create=True)
+        with self.__lock(slot):
+            self.__quantities[slot] += quantity
+
+    def remove(self, item: str, quantity: Optional[float] = None):
+        """Remove the given quantity of an item from the inventory.
+
+        If the quantity is not given or negative, the item is removed completely.
+
+        Arguments:
+            item (str): The name of the item to remove.
+            quantity (float, optional): The quantity of the item to remove. Defaults to None.
+        """
+        if quantity is not None and quantity < 0:
+            self.add(item, -quantity)
+            return
+        slot = self.__slot(item)
+        if slot is None:
+            return
+
+        with self.__lock(slot):
+            stored = self.__quantities[slot]
+            self.__quantities[slot] = 0 if quantity is None or stored <= quantity else stored - quantity
+
+    def items(self) -> list[tuple[str, float]]:
+        """Return a list of the items in the inventory."""
+        self.__refresh()
+        return [(item, self.__quantities[slot]) for item, slot in self.__slots.items() if self.__quantities[slot] > 0]
+
+    def names(self) -> list[str]:
+        """Return a list of the item names in the inventory."""
+        return [item for item, _ in self.items()]
+
+    @contextmanager
+    def transaction(self):
+        """Hold all locks of the inventory, so no other process can change it meanwhile."""
+        with ExitStack() as stack:
+            for lock in self.__locks:
+                stack.enter_context(lock)
+            yield self
+
+    def snapshot(self, loader: InventoryLoader):
+        """Save a consistent copy of the inventory to a file.
+
+        Arguments:
+            loader (InventoryLoader): The loader to save the inventory with.
+        """
+        with self.transaction():
+            inventory = Inventory(**dict(self.items()))
+        loader.save_inventory(inventory)
+
+    def start_snapshots(self, loader: InventoryLoader, interval: float):
+        """Save a copy of the inventory to a file periodically from a background thread of this process.
+
+        Arguments:
+            loader (InventoryLoader): The loader to save the inventory with.
+            interval (float): The time between two snapshots in seconds.
+        """
+        self.stop_snapshots()
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.snapshot(loader)
+            self.snapshot(loader)
+
+        thread = threading.Thread(target=run, name=f"snapshot-{self.name}", daemon=True)
+        self.__snapshots = (stop, thread)
+        thread.start()
+
+    def stop_snapshots(self):
+        """Stop the periodic snapshots and wait for the final snapshot to be saved."""
+        if self.__snapshots is not None:
+            stop, thread = self.__snapshots
+            self.__snapshots = None
+            stop.set()
+            thread.join()
+
+    def close(self):
+        """Detach this process from the shared memory."""
+        self.stop_snapshots()
+        self.__count.release()
+        self.__names.release()
+        self.__quantities.release()
+        self.__memory.close()
+
+    def unlink(self):
+        """Release the shared memory. Only the creating process should call this, after all processes closed it."""
+        self.__memory.unlink()
+
+    def __lock(self, slot: int) -> RLock:
+        return self.__locks[slot % len(self.__locks)]
+
+    def __slot(self, item: str, create: bool = False) -> Optional[int]:
+        if item in self.__slots:
+            return self.__slots[item]
+        self.__refresh()
+        if item in self.__slots or not create:
+            return self.__slots.get(item)
+
+        encoded = item.encode("utf-8")
+        if len(encoded) > NAME_SIZE or b"\0" in encoded:
+            raise ValueError(f"Item name '{item}' is longer than {NAME_SIZE} bytes or contains null bytes")
+
+        with self.__table_lock:
+            self.__refresh()
+            if item in self.__slots:
+                return self.__slots[item]
+            slot = self.__count[0]
+            if slot >= self.__capacity:
+                raise InventoryCapacityError(f"Shared inventory '{self.name}' has no free slot for item '{item}'")
+            self.__names[slot * NAME_SIZE:slot * NAME_SIZE + len(encoded)] = encoded
+            self.__count[0] = slot + 1
+            self.__slots[item] = slot
+            return slot
+
+    def __refresh(self):
+        for slot in range(len(self.__slots), self.__count[0]):
+            name = bytes(self.__names[slot * NAME_SIZE:(slot + 1) * NAME_SIZE]).rstrip(b"\0")
+            self.__slots[name.decode("utf-8")] = slot
@@ -0,0 +1,204 @@
+"""
+Streaming inventory parser.
+
+This module provides an incremental parser for inventory files, which reads a json5 object of item names to quantities
+chunk by chunk instead of loading the whole file at once.
+
+Classes:
+    - InventoryStreamParser: An iterator over the validated items of an inventory file.
+"""
+
+import re
+from io import TextIOWrapper
+from typing import Iterator, Optional
+
+from inventory_app.inventory import InvalidFileFormat
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""The number of characters read from the file at once."""
+
+_LOOKAHEAD = 32
+"""The number of characters that must follow a token before it is accepted or rejected, so chunk boundaries cannot split it."""
+
+_WHITESPACE = re.compile(r"\s*")
+_LINE_COMMENT = re.compile(r"//[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_STRING = re.compile(r"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'", re.DOTALL)
+_IDENTIFIER = re.compile(r"(?:[^\W\d]|\$)(?:\w|\$)*")
+_BOOLEAN = re.compile(r"(?:true|false)(?![\w$])")
+_NUMBER = re.compile(r"[+-]?(?:Infinity|NaN|0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)")
+_WORD = re.compile(r"[\w$.+-]+|.", re.DOTALL)
+_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)", re.DOTALL)
+_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v", "0": "\0", "\n": "", "\r": "", "\r\n": "", "\u2028": "", "\u2029": ""}
+
+
+def _unescape(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape[0] in "ux" and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    return _ESCAPES.get(escape, escape)
+
+
+def _to_number(token: str) -> float:
+    unsigned = token.lstrip("+-")
+    if unsigned[:2] in ("0x", "0X"):
+        number = int(unsigned, 16)
+        return -number if token.startswith("-") else number
+    if unsigned in ("Infinity", "NaN") or any(c in unsigned for c in ".eE"):
+        return float(token)
+    return int(token)
+
+
+class InventoryStreamParser:
+    """
+    An iterator over the items of an inventory file.
+
+    The file is read in chunks and every key and value is validated as soon as it is read, so only the current chunk
+    and the current token are kept in memory. The first invalid entry raises an `InvalidFileFormat` naming the
+    offending key and its byte offset in the file.
+
+    Byte offsets are only exact if the file was opened without newline translation, i.e. with `newline=""`.
+    """
+
+    __file: TextIOWrapper
+    """The file to read from."""
+
+    __chunk_size: int
+    """The number of characters read from the file at once."""
+
+    __buffer: str
+    """The unconsumed characters read from the file."""
+
+    __pos: int
+    """The position of the next unconsumed character in the buffer."""
+
+    __offset: int
+    """The byte offset of the start of the buffer in the file."""
+
+    __eof: bool
+    """Whether the end of the file has been reached."""
+
+    def __init__(self, file: TextIOWrapper, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the InventoryStreamParser.
+
+        Arguments:
+            file (TextIOWrapper): The file to read from.
+            chunk_size (int, optional): The number of characters read from the file at once.
+        """
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__buffer = ""
+        self.__pos = 0
+        self.__offset = 0
+        self.__eof = False
+
+    def __iter__(self) -> Iterator[tuple[str, float]]:
+        self.__skip()
+        if self.__peek() != "{":
+            raise self.__error("Content is not of type dict")
+        self.__pos += 1
+
+        while True:
+            self.__skip()
+            if self.__peek() == "}":
+                self.__pos += 1
+                break
+
+            key = self.__key()
+            self.__skip()
+            if self.__peek() != ":":
+                raise self.__error(f"Expected ':' after key '{key}'")
+            self.__pos += 1
+            self.__skip()
+            yield key, self.__value(key)
+
+            self.__skip()
+            delimiter = self.__peek()
+            self.__pos += 1
+            if delimiter == "}":
+                break
+            if delimiter != ",":
+                self.__pos -= 1
+                raise self.__error(f"Expected ',' or '}}' after value for key '{key}'")
+
+        self.__skip()
+        if self.__peek():
+            raise self.__error("Unexpected content after the inventory")
+
+    def __key(self) -> str:
+        if self.__peek() in ("\"", "'"):
+            return self.__string()
+        match = self.__match(_IDENTIFIER)
+        if match is None:
+            raise self.__error("Expected an item name")
+        return match.group()
+
+    def __value(self, key: str) -> float:
+        first = self.__peek()
+        start = (self.__offset, self.__buffer, self.__pos)
+        if first in ("\"", "'"):
+            value = self.__string()
+        elif not first:
+            value = "<end of file>"
+        elif boolean := self.__match(_BOOLEAN):
+            # Booleans are numbers in Python, so they are accepted like by InventoryLoader.load_inventory.
+            return boolean.group() == "true"
+        else:
+            match = self.__match(_NUMBER)
+            if match is not None and not _IDENTIFIER.match(self.__peek()):
+                return _to_number(match.group())
+            value = (match.group() if match else "") + self.__match(_WORD).group()
+
+        offset, buffer, pos = start
+        offset += len(buffer[:pos].encode("utf-8"))
+        raise InvalidFileFormat(f"Content value '{value}' for key '{key}' is not a number at byte {offset}")
+
+    def __string(self) -> str:
+        match = self.__match(_STRING, unbounded=True)
+        if match is None:
+            raise self.__error("Unterminated string")
+        return _ESCAPE.sub(_unescape, match.group()[1:-1])
+
+    def __skip(self):
+        while True:
+            self.__match(_WHITESPACE)
+            start = self.__peek(2)
+            if start == "//":
+                self.__match(_LINE_COMMENT)
+            elif start == "/*":
+                if self.__match(_BLOCK_COMMENT, unbounded=True) is None:
+                    raise self.__error("Unterminated comment")
+            else:
+                return
+
+    def __match(self, pattern: re.Pattern, unbounded: bool = False) -> Optional[re.Match]:
+        while True:
+            match = pattern.match(self.__buffer, self.__pos)
+            end = self.__pos if match is None else match.end()
+            decided = len(self.__buffer) - end >= _LOOKAHEAD and (match is not None or not unbounded)
+            if decided or self.__eof:
+                break
+            self.__fill()
+
+        if match is not None:
+            self.__pos = match.end()
+        return match
+
+    def __peek(self, count: int = 1) -> str:
+        while len(self.__buffer) - self.__pos < count and not self.__eof:
+            self.__fill()
+        return self.__buffer[self.__pos:self.__pos + count]
+
+    def __fill(self):
+        chunk = self.__file.read(self.__chunk_size)
+        self.__offset = self.__byte_offset()
+        self.__buffer = self.__buffer[self.__pos:] + chunk
+        self.__pos = 0
+        self.__eof = not chunk
+
+    def __byte_offset(self) -> int:
+        return self.__offset + len(self.__buffer[:self.__pos].encode("utf-8"))
+
+    def __error(self, message: str) -> InvalidFileFormat:
+        return InvalidFileFormat(f"{message} at byte {self.__byte_offset()}")
@@ -0,0 +1,177 @@
+"""
+Ingredient substitution API.
+
+This module contains the SubstitutionCatalog class, which holds the rules for replacing one ingredient by another.
+
+Classes:
+    - SubstitutionCatalog: A catalogue of substitution rules with cached transitive resolution.
+"""
+
+from heapq import heappop, heappush
+from math import inf, log
+from typing import Optional
+
+_TOLERANCE = 1e-9
+"""The tolerance for comparing logarithmic ratios, so rounding errors around a ratio of 1 are not taken as savings."""
+
+
+class SubstitutionCatalog:
+    """
+    A catalogue of substitution rules.
+
+    A rule states that a substitute can replace an original ingredient at a ratio, i.e. one unit of the original is
+    replaced by `ratio` units of the substitute. Rules are transitive: if margarine replaces butter at 1.0 and oil
+    replaces margarine at 0.8, oil replaces butter at 0.8.
+
+    Rules closing a cycle whose ratios multiply to less than 1 are rejected, since going around such a cycle would make
+    every ingredient on it cheaper than itself.
+
+    Every ingredient has a potential, chosen so that no rule has a negative cost `log(ratio)` once the potentials are
+    added. Adding a rule only adjusts the potentials it affects. With these costs, the substitutes of an ingredient are
+    resolved like shortest paths with non-negative lengths.
+
+    The substitutes of an ingredient are resolved once and cached. Changing a rule only invalidates the cached
+    resolutions whose cheapest substitutes use the rule or would get cheaper through it.
+    """
+
+    __rules: dict[str, dict[str, float]]
+    """The direct substitutes and their ratios for every original ingredient."""
+
+    __potentials: dict[str, float]
+    """The potential of every ingredient, so that `log(ratio) + potential[original] - potential[substitute]` is never negative."""
+
+    __trees: dict[str, dict[str, tuple[float, Optional[str]]]]
+    """The ratio and the ingredient it is substituted for of every reached ingredient, by resolved ingredient."""
+
+    __resolved: dict[str, list[tuple[str, float]]]
+    """The cached transitive substitutes of every resolved ingredient, cheapest first."""
+
+    __dependents: dict[str, set[str]]
+    """The cached ingredients whose resolution reached each ingredient."""
+
+    def __init__(self):
+        """Initialize an empty SubstitutionCatalog."""
+        self.__rules = {}
+        self.__potentials = {}
+        self.__trees = {}
+        self.__resolved = {}
+        self.__dependents = {}
+
+    def __len__(self):
+        return sum(len(substitutes) for substitutes in self.__rules.values())
+
+    def add_rule(self, substitute: str, original: str, ratio: float = 1):
+        """
+        Add or replace the rule that a substitute can replace an original ingredient.
+
+        Arguments:
+            substitute (str): The ingredient used instead.
+            original (str): The ingredient that is replaced.
+            ratio (float, optional): The quantity of the substitute replacing one unit of the original. Defaults to 1.
+
+        Raises:
+            ValueError: If the ratio is not positive, the substitute is the original or the rule closes a cycle whose ratios multiply to less than 1.
+        """
+        if ratio <= 0:
+            raise ValueError(f"Substitution ratio {ratio} is not positive")
+        if substitute == original:
+            raise ValueError(f"Ingredient '{original}' cannot substitute itself")
+
+        self.__lower_potentials(substitute, original, ratio)
+        self.__rules.setdefault(original, {})[substitute] = ratio
+        self.__invalidate(substitute, original, ratio)
+
+    def remove_rule(self, substitute: str, original: str):
+        """
+        Remove the rule that a substitute can replace an original ingredient, if it exists.
+
+        Arguments:
+            substitute (str): The ingredient used instead.
+            original (str): The ingredient that is replaced.
+        """
+        substitutes = self.__rules.get(original, {})
+        if substitutes.pop(substitute, None) is None:
+            return
+        if not substitutes:
+            del self.__rules[original]
+        self.__invalidate(substitute, original, None)
+
+    def substitutes(self, original: str) -> list[tuple[str, float]]:
+        """
+        Return all direct and transitive substitutes of an ingredient.
+
+        Arguments:
+            original (str): The ingredient to replace.
+
+        Returns:
+            list[tuple[str, float]]: The substitutes and their ratios, smallest ratio first.
+        """
+        if original not in self.__resolved:
+            self.__resolve(original)
+        return self.__resolved[original]
+
+    def __cost(self, original: str, substitute: str, ratio: float) -> float:
+        return log(ratio) + self.__potentials.get(original, 0) - self.__potentials.get(substitute, 0)
+
+    def __lower_potentials(self, substitute: str, original: str, ratio: float):
+        # Only the ingredients reachable from the substitute whose potential is too high for the new rule are lowered,
+        # largest decrease first. Reaching the original again means the rule closes a cycle of negative cost.
+        lowered: dict[str, float] = {}
+        queue = [(self.__cost(original, substitute, ratio), substitute, ratio)]
+        while queue and queue[0][0] < 0:
+            cost, ingredient, product = heappop(queue)
+            if ingredient in lowered:
+                continue
+            if ingredient == original:
+                if cost < -_TOLERANCE:
+                    raise ValueError(f"Rule '{substitute}' for '{original}' closes a cycle with ratio {product}, which is less than 1")
+                continue
+            lowered[ingredient] = self.__potentials.get(ingredient, 0) + cost
+            for next_substitute, step in self.__rules.get(ingredient, {}).items():
+                if next_substitute not in lowered:
+                    heappush(queue, (cost + self.__cost(ingredient, next_substitute, step), next_substitute, product * step))
+        self.__potentials.update(lowered)
+
+    def __resolve(self, original: str):
+        tree: dict[str, tuple[float, Optional[str]]] = {}
+        tentative = {original: (1.0, None)}
+        lengths = {original: 0.0}
+        queue = [(0.0, original)]
+        while queue:
+            length, ingredient = heappop(queue)
+            if ingredient in tree:
+                continue
+            tree[ingredient] = tentative[ingredient]
+            ratio = tree[ingredient][0]
+            for substitute, step in self.__rules.get(ingredient, {}).items():
+                if substitute in tree:
+                    continue
+                # Rules closing a cycle with a ratio just below 1 may be slightly negative within the tolerance.
+                candidate = length + max(self.__cost(ingredient, substitute, step), 0)
+                if candidate < lengths.get(substitute, inf):
+                    lengths[substitute] = candidate
+                    tentative[substitute] = (ratio * step, ingredient)
+                    heappush(queue, (candidate, substitute))
+
+        self.__trees[original] = tree
+        substitutes = ((substitute, ratio) for substitute, (ratio, _) in tree.items() if substitute != original)
+        self.__resolved[original] = sorted(substitutes, key=lambda substitute: substitute[1])
+        for ingredient in tree:
+            self.__dependents.setdefault(ingredient, set()).add(original)
+
+    def __invalidate(self, substitute: str, original: str, ratio: Optional[float]):
+        for resolved in list(self.__dependents.get(original, ())):
+            tree = self.__trees[resolved]
+            current = tree.get(substitute)
+            uses_rule = current is not None and current[1] == original
+            cheaper = ratio is not None and substitute != resolved and (current is None or tree[original][0] * ratio < current[0] * (1 - _TOLERANCE))
+            if uses_rule or cheaper:
+                self.__drop(resolved)
+
+    def __drop(self, resolved: str):
+        del self.__resolved[resolved]
+        for ingredient in self.__trees.pop(resolved):
+            dependents = self.__dependents[ingredient]
+            dependents.discard(resolved)
+            if not dependents:
+                del self.__dependents[ingredient]
@@ -3,6 +3,8 @@ from pytest import raises
 from inventory_app.inventory import Inventory
 from inventory_app.recipe import Recipe
 from inventory_app.cooking_service import CookingException, CookingService
+from inventory_app.reservation import ReservationBook, ReservationError
+from inventory_app.substitution import SubstitutionCatalog
 
 
 def test__recipe_ingredients_availiable():
@@ -45,3 +47,118 @@ def test__cooking_with_unsufficient_ingredients():
         cooking_service.cook_recipe(cookies)
 
     assert inventory == {"milk": 2, "flour": 1, "sugar": 2, "noodles": 4}
+
+
+def test__recipe_cookable_with_substitute():
+    """A missing ingredient is replaced by an available substitute."""
+    inventory = Inventory(margarine=3, flour=3)
+    cake = Recipe(portions=2, time=30, butter=2, flour=2)
+    substitutions = SubstitutionCatalog()
+    substitutions.add_rule("margarine", "butter", 1.5)
+
+    cooking_service = CookingService(inventory, substitutions)
+    assert cooking_service.is_cookable(cake)
+    assert cooking_service.plan_recipe(cake) == {"margarine": 3, "flour": 2}
+
+
+def test__recipe_not_cookable_without_substitute_rules():
+    """Substitutes are not used without substitution rules."""
+    inventory = Inventory(margarine=3, flour=3)
+    cake = Recipe(portions=2, time=30, butter=2, flour=2)
+
+    cooking_service = CookingService(inventory)
+    assert not cooking_service.is_cookable(cake)
+    assert cooking_service.plan_recipe(cake) is None
+
+
+def test__cooking_with_partial_substitute():
+    """The original ingredient is used first, substitutes only cover the missing quantity."""
+    inventory = Inventory(butter=1, margarine=1, oil=5)
+    cake = Recipe(portions=2, time=30, butter=3)
+    substitutions = SubstitutionCatalog()
+    substitutions.add_rule("margarine", "butter", 1)
+    substitutions.add_rule("oil", "margarine", 2)
+
+    cooking_service = CookingService(inventory, substitutions)
+    cooking_service.cook_recipe(cake)
+
+    assert inventory == {"oil": 3}
+
+
+def test__substitute_shared_between_ingredients():
+    """A substitute used for one ingredient is not available for another one anymore."""
+    inventory = Inventory(margarine=2)
+    cake = Recipe(portions=2, time=30, butter=1, lard=2)
+    substitutions = SubstitutionCatalog()
+    substitutions.add_rule("margarine", "butter")
+    substitutions.add_rule("margarine", "lard")
+
+    cooking_service = CookingService(inventory, substitutions)
+    assert not cooking_service.is_cookable(cake)
+
+    with raises(CookingException, match="Not enough ingredients to cook the recipe"):
+        cooking_service.cook_recipe(cake)
+    assert inventory == {"margarine": 2}
+
+
+def test__substitute_is_also_an_ingredient():
+    """An ingredient's own stock is not used as a substitute for an earlier ingredient of the recipe."""
+    inventory = Inventory(margarine=1, oil=1)
+    substitutions = SubstitutionCatalog()
+    substitutions.add_rule("margarine", "butter")
+    substitutions.add_rule("oil", "butter")
+
+    cooking_service = CookingService(inventory, substitutions)
+    assert cooking_service.plan_recipe(Recipe(portions=2, time=30, butter=1, margarine=1)) == {"margarine": 1, "oil": 1}
+    assert cooking_service.plan_recipe(Recipe(portions=2, time=30, margarine=1, butter=1)) == {"margarine": 1, "oil": 1}
+
+
+def test__reserved_ingredients_not_cookable():
+    """Reserved ingredients are not available for cooking."""
+    inventory = Inventory(milk=2, flour=3, sugar=2)
+    cookies = Recipe(portions=2, time=30, milk=1, flour=2, sugar=1)
+
+    cooking_service = CookingService(inventory, reservations=ReservationBook(inventory))
+    cooking_service.reserve_recipe(cookies, ttl=60)
+    assert not cooking_service.is_cookable(cookies)
+    assert inventory == {"milk": 2, "flour": 3, "sugar": 2}
+
+    with raises(CookingException, match="Not enough ingredients to cook the recipe"):
+        cooking_service.reserve_recipe(cookies, ttl=60)
+
+
+def test__cook_reservation():
+    """Cooking a reservation uses the reserved ingredients."""
+    inventory = Inventory(milk=2, flour=3, sugar=2)
+    cookies = Recipe(portions=2, time=30, milk=1, flour=2, sugar=1)
+
+    cooking_service = CookingService(inventory, reservations=ReservationBook(inventory))
+    reservation = cooking_service.reserve_recipe(cookies, ttl=60)
+    cooking_service.cook_reservation(reservation)
+
+    assert inventory == {"milk": 1, "flour": 1, "sugar": 1}
+    with raises(ReservationError):
+        cooking_service.cook_reservation(reservation)
+
+
+def test__cook_reservation_with_missing_ingredients():
+    """A reservation whose ingredients were used outside the reservations cannot be cooked."""
+    inventory = Inventory(milk=5)
+    cooking_service = CookingService(inventory, reservations=ReservationBook(inventory))
+    reservation = cooking_service.reserve_recipe(Recipe(portions=1, time=5, milk=4), ttl=60)
+    inventory.remove("milk", 3)
+
+    with raises(ReservationError):
+        cooking_service.cook_reservation(reservation)
+    assert inventory == {"milk": 2}
+
+
+def test__reservation_without_book():
+    """Reserving needs a reservation book."""
+    cooking_service = CookingService(Inventory(milk=2))
+    cookies = Recipe(portions=2, time=30, milk=1)
+
+    with raises(CookingException, match="No reservations to reserve the recipe in"):
+        cooking_service.reserve_recipe(cookies, ttl=60)
+    with raises(CookingException, match="No reservations to cook the recipe from"):
+        cooking_service.cook_reservation(1)
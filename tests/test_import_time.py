@@ -0,0 +1,98 @@
+"""
+Cold-start import tests for the inventory_app package.
+
+Every public module is imported in fresh interpreters, alternating with json5, and its import time is compared to the
+one of json5. Both are slowed down alike by a slow or busy machine, so the ratio stays stable enough to be checked on
+every run.
+"""
+import os
+import subprocess
+import sys
+from pytest import mark, raises
+
+IMPORT_BUDGETS = {
+    "inventory_app": (0.35, 0.06),
+    "inventory_app.inventory": (0.57, 1.50),
+    "inventory_app.recipe": (0.45, 1.17),
+    "inventory_app.cooking_service": (0.92, 1.62),
+    "inventory_app.streaming": (0.98, 1.68),
+    "inventory_app.pooled_inventory": (0.68, 1.61),
+    "inventory_app.substitution": (0.45, 1.31),
+    "inventory_app.shared_inventory": (0.81, 3.87),
+    "inventory_app.reservation": (0.71, 1.79),
+}
+"""
+Import time budgets per module as (own, cumulative) ratios to the import time of json5.
+
+The own time is spent in the modules outside the standard library, i.e. in the package and its dependencies. The
+cumulative time also includes the standard library modules. The budgets are 1.5 times the highest ratios measured in
+three runs of 5 rounds. Importing json5 eagerly adds 1.0 to the own ratio of a module, so it exceeds every budget.
+"""
+
+ROUNDS = 5
+"""The number of fresh interpreters per module, of which the fastest is compared."""
+
+DEFERRED_MODULES = ["json5"]
+"""Modules that must not be imported by importing any public module."""
+
+
+def _cold_import(module: str) -> tuple[int, int, set[str]]:
+    """Import a module in a fresh interpreter. Return its own and cumulative import time and the imported modules."""
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # compiling the sources on every import would dominate the times
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env, check=True)
+
+    own, cumulative = 0, None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own_time, cumulative_time, name = line.removeprefix("import time:").split("|")
+        if name.strip().split(".")[0] not in sys.stdlib_module_names:
+            own += int(own_time)
+        if name.strip() == module:
+            cumulative = int(cumulative_time)
+    if cumulative is None:
+        raise AssertionError(f"No import time reported for '{module}'")
+    return own, cumulative, set(result.stdout.split())
+
+
+@mark.parametrize("module", IMPORT_BUDGETS)
+def test__import_within_budget(module: str):
+    """Importing a public module in a fresh interpreter stays within its time budget relative to json5."""
+    measured, reference = [], []
+    for _ in range(ROUNDS):
+        measured.append(_cold_import(module)[:2])
+        reference.append(_cold_import("json5")[:2])
+    own, cumulative = (min(times) for times in zip(*measured))
+    json5_own, json5_cumulative = (min(times) for times in zip(*reference))
+
+    own_budget, cumulative_budget = IMPORT_BUDGETS[module]
+    assert own <= own_budget * json5_own
+    assert cumulative <= cumulative_budget * json5_cumulative
+
+
+@mark.parametrize("module", IMPORT_BUDGETS)
+def test__import_defers_serializer_backends(module: str):
+    """Importing a public module does not import the serializer backends."""
+    _, _, imported = _cold_import(module)
+    assert imported.isdisjoint(DEFERRED_MODULES)
+
+
+def test__submodules_loaded_lazily():
+    """Importing the package does not import its submodules until they are accessed."""
+    code = "import sys, inventory_app; print('inventory_app.inventory' in sys.modules); inventory_app.cooking_service; print(' '.join(sys.modules))"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    eager, imported = result.stdout.splitlines()
+    assert eager == "False"
+    assert "inventory_app.inventory" in imported.split()
+
+
+def test__unknown_attribute():
+    """Accessing an unknown package attribute still raises an AttributeError."""
+    import inventory_app
+
+    assert "cooking_service" in dir(inventory_app)
+    with raises(AttributeError, match="module 'inventory_app' has no attribute 'kitchen'"):
+        inventory_app.kitchen
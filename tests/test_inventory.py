@@ -243,3 +243,27 @@ def test__names_should_be_like_inner_names():
     """The names of an inventory should be like the inner names."""
     inventory = Inventory(milk=2, sugar=1)
     assert inventory.names() == {"milk", "sugar"}
+
+
+def test__observe_changes():
+    """Observers are notified with the previous and the new quantity of every change."""
+    inventory = Inventory(milk=2)
+    changes = []
+    inventory.observe(lambda item, previous, quantity: changes.append((item, previous, quantity)))
+
+    inventory.add("milk", 3)
+    inventory.remove("milk", 1)
+    inventory["sugar"] = 2
+    del inventory["milk"]
+    assert changes == [("milk", 2, 5), ("milk", 5, 4), ("sugar", 0, 2), ("milk", 4, 0)]
+
+
+def test__unobserve_changes():
+    """Unregistered observers are no longer notified."""
+    inventory = Inventory(milk=2)
+    changes = []
+    inventory.observe(changes.append)
+    inventory.unobserve(changes.append)
+
+    inventory.add("milk", 3)
+    assert changes == []
@@ -1,6 +1,9 @@
 """Unit tests for the Inventory class."""
+import bz2
+import gzip
+import lzma
 import json5
-from pytest import approx, raises
+from pytest import approx, mark, raises
 from inventory_app.inventory import Inventory, InventoryLoader, InvalidFileFormat, InventorySerializer
 
 
@@ -37,3 +40,80 @@ def test__disk_roundtrip():
     loader.save_inventory(inventory)
     loaded_inventory = loader.load_inventory()
     assert inventory == loaded_inventory
+
+
+@mark.parametrize("extension", [".json5.gz", ".json.gz", ".json5.bz2", ".json.xz"])
+def test__compressed_disk_roundtrip(extension: str):
+    """Saves and loads a compressed inventory. Check if same."""
+    inventory = Inventory(milk=3, sugar=1.4)
+
+    loader = InventoryLoader(f"tests/tmp/compressed{extension}", InventorySerializer(), compresslevel=1)
+    loader.save_inventory(inventory)
+    assert loader.load_inventory() == inventory
+    assert list(loader.iter_chunks(1)) == [{"milk": 3}, {"sugar": 1.4}]
+
+
+@mark.parametrize("extension,module", [(".json5.gz", gzip), (".json5.bz2", bz2), (".json5.xz", lzma)])
+def test__compressed_file_format(extension: str, module):
+    """A compressed inventory is the json5 inventory format compressed by the compression of its extension."""
+    loader = InventoryLoader(f"tests/tmp/format{extension}", InventorySerializer())
+    loader.save_inventory(Inventory(milk=3, sugar=1.4, cheese=1))
+
+    with module.open(f"tests/tmp/format{extension}", 'rt', encoding="utf-8") as f1, open("tests/persistance/valid.json5", 'r', encoding="utf-8") as f2:
+        assert json5.load(f1) == json5.load(f2)
+
+
+def test__load_missing_compressed():
+    """Loading a missing compressed file results in an empty inventory."""
+    loader = InventoryLoader("tests/persistance/missing.json5.gz", InventorySerializer())
+    assert loader.load_inventory() == {}
+
+
+def test__load_wrong_compressed():
+    """Loads an existing compressed file in an invalid format."""
+    with gzip.open("tests/tmp/invalid.json5.gz", 'wt', encoding="utf-8") as file:
+        file.write('{milk: 3, sugar: "gupta", cheese: 1}')
+
+    loader = InventoryLoader("tests/tmp/invalid.json5.gz", InventorySerializer())
+    with raises(InvalidFileFormat, match="Content value 'gupta' for key 'sugar' is not a number"):
+        loader.load_inventory()
+
+
+def test__compressed_name_not_extended():
+    """A path with a compressed json extension is used as is, other paths get the json5 extension."""
+    assert InventoryLoader._fullpath("tests/tmp/inventory.json.bz2") == "tests/tmp/inventory.json.bz2"
+    assert InventoryLoader._fullpath("tests/tmp/inventory.gz") == "tests/tmp/inventory.gz.json5"
+
+
+@mark.parametrize("extension", [".json5.gz", ".json5.bz2", ".json5.xz"])
+def test__load_corrupt_compressed(extension: str):
+    """Loading a compressed file that is not in its compression format fails as an invalid file format."""
+    with open(f"tests/tmp/corrupt{extension}", 'wb') as file:
+        file.write(b"{milk: 3, sugar: 1.4, cheese: 1}")
+
+    loader = InventoryLoader(f"tests/tmp/corrupt{extension}", InventorySerializer())
+    with raises(InvalidFileFormat, match="could not be decompressed"):
+        loader.load_inventory()
+
+
+def test__load_truncated_compressed():
+    """Loading a truncated compressed file fails as an invalid file format."""
+    content = gzip.compress(b"{milk: 3, sugar: 1.4, cheese: 1}")
+    with open("tests/tmp/truncated.json5.gz", 'wb') as file:
+        file.write(content[:-10])
+
+    loader = InventoryLoader("tests/tmp/truncated.json5.gz", InventorySerializer())
+    with raises(InvalidFileFormat, match="could not be decompressed"):
+        loader.load_inventory()
+
+
+@mark.parametrize("content,expected", [("{milk: 0, sugar: 1.4}", {"milk": 0, "sugar": 1.4}), ("{milk: true}", {"milk": True})])
+def test__compressed_loads_like_plain(content: str, expected: dict[str, float]):
+    """The same content loads the same from a plain and from a compressed file."""
+    with open("tests/tmp/same.json5", 'w', encoding="utf-8") as plain, gzip.open("tests/tmp/same.json5.gz", 'wt', encoding="utf-8") as compressed:
+        plain.write(content)
+        compressed.write(content)
+
+    plain_inventory = InventoryLoader("tests/tmp/same.json5", InventorySerializer()).load_inventory()
+    compressed_inventory = InventoryLoader("tests/tmp/same.json5.gz", InventorySerializer()).load_inventory()
+    assert plain_inventory == compressed_inventory == expected
@@ -0,0 +1,122 @@
+"""Unit tests for the streaming inventory parser and loader."""
+from io import StringIO
+import json5
+from pytest import approx, mark, raises
+from inventory_app.inventory import Inventory, InventoryLoader, InvalidFileFormat, InventorySerializer
+from inventory_app.streaming import InventoryStreamParser
+
+FORMATTED = """// inventory export
+{
+    milk: 3, /* liters */
+    'sugar': +1.4,
+    "grated cheese": .5e1,
+    $eggs: 0x0C,
+    "quoted \\"name\\"\\u0021": 2.,
+    spam: Infinity,
+}
+"""
+
+
+def _parse(text: str, chunk_size: int = 4) -> list[tuple[str, float]]:
+    return list(InventoryStreamParser(StringIO(text), chunk_size))
+
+
+@mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test__parse_json5_features(chunk_size: int):
+    """The parser understands comments, quoted keys and json5 numbers regardless of chunk boundaries."""
+    expected = list(json5.loads(FORMATTED).items())
+    assert _parse(FORMATTED, chunk_size) == expected
+
+
+def test__parse_booleans():
+    """Booleans are accepted as numbers, like when loading the whole file at once."""
+    assert _parse("{milk: true, sugar: false, trueish: 1}") == [("milk", True), ("sugar", False), ("trueish", 1)]
+    with raises(InvalidFileFormat, match="Content value 'trueish' for key 'milk' is not a number"):
+        _parse("{milk: trueish}")
+
+
+def test__parse_empty_object():
+    """An empty object yields no items."""
+    assert _parse(" { } ") == []
+
+
+def test__parse_not_an_object():
+    """Content other than an object is rejected."""
+    with raises(InvalidFileFormat, match="Content is not of type dict at byte 1"):
+        _parse(" [1, 2]")
+
+
+def test__parse_invalid_value_reports_key_and_offset():
+    """A value that is not a number is reported with its key and byte offset."""
+    with raises(InvalidFileFormat, match="Content value 'gupta' for key 'sugar' is not a number at byte 17"):
+        _parse('{milk: 3, sugar: "gupta", cheese: 1}')
+
+
+def test__parse_invalid_value_offset_counts_bytes():
+    """The reported offset counts bytes, not characters."""
+    with raises(InvalidFileFormat, match="Content value 'null' for key 'crème' is not a number at byte 21"):
+        _parse('{"café": 1, crème: null}', chunk_size=3)
+
+
+@mark.parametrize(
+    "text,message",
+    [
+        ("{milk: 3abc}", "Content value '3abc' for key 'milk' is not a number"),
+        ("{milk: {}}", "Content value '{' for key 'milk' is not a number"),
+        ("{milk: ", "Content value '<end of file>' for key 'milk' is not a number"),
+        ("{milk 3}", "Expected ':' after key 'milk' at byte 6"),
+        ("{milk: 3 sugar: 1}", "Expected ',' or '}' after value for key 'milk' at byte 9"),
+        ("{milk: 3", "Expected ',' or '}' after value for key 'milk' at byte 8"),
+        ("{3: 1}", "Expected an item name at byte 1"),
+        ("{'milk: 1}", "Unterminated string at byte 1"),
+        ("{milk: 1 /* comment }", "Unterminated comment at byte 9"),
+        ("{milk: 1} {}", "Unexpected content after the inventory at byte 10"),
+    ],
+)
+def test__parse_fails_fast(text: str, message: str):
+    """Malformed content is rejected with a description of the problem."""
+    with raises(InvalidFileFormat, match=message):
+        _parse(text)
+
+
+def test__parse_stops_at_first_invalid_entry():
+    """Items before the first invalid entry are yielded, nothing after it is read."""
+    items = iter(InventoryStreamParser(StringIO("{milk: 3, sugar: null, cheese: 1}")))
+    assert next(items) == ("milk", 3)
+    with raises(InvalidFileFormat, match="for key 'sugar'"):
+        next(items)
+
+
+def test__stream_from_disk():
+    """Streams an existing file in the correct format."""
+    loader = InventoryLoader("tests/persistance/valid", InventorySerializer())
+    inventory = loader.stream_inventory()
+    assert inventory == {"milk": 3, "sugar": approx(1.4), "cheese": 1}
+
+
+def test__stream_into_existing_inventory():
+    """Streaming into an existing inventory overrides the streamed items only."""
+    inventory = Inventory(milk=1, flour=2)
+    loader = InventoryLoader("tests/persistance/valid", InventorySerializer())
+    assert loader.stream_inventory(inventory) is inventory
+    assert inventory == {"milk": 3, "sugar": approx(1.4), "cheese": 1, "flour": 2}
+
+
+def test__stream_wrong_from_disk():
+    """Streams an existing file in an invalid format."""
+    loader = InventoryLoader("tests/persistance/invalid", InventorySerializer())
+    with raises(InvalidFileFormat, match="Content value 'gupta' for key 'sugar' is not a number at byte 17"):
+        loader.stream_inventory()
+
+
+def test__stream_missing_file():
+    """Streaming a missing file results in an empty inventory."""
+    loader = InventoryLoader("tests/persistance/missing", InventorySerializer())
+    assert loader.stream_inventory() == {}
+    assert list(loader.iter_chunks(2)) == []
+
+
+def test__stream_chunks():
+    """The items are yielded in chunks of the given size."""
+    loader = InventoryLoader("tests/persistance/valid", InventorySerializer())
+    assert list(loader.iter_chunks(2)) == [{"milk": 3, "sugar": approx(1.4)}, {"cheese": 1}]
@@ -0,0 +1,147 @@
+"""Unit tests for the reorder thresholds of the Inventory class."""
+import pytest
+
+from inventory_app.inventory import Inventory
+
+
+def test__no_thresholds_nothing_below():
+    """An inventory without thresholds has no items below threshold."""
+    inventory = Inventory(milk=2, sugar=1)
+    assert inventory.below_threshold() == []
+    assert inventory.scarcest(3) == []
+
+
+def test__set_threshold():
+    """A set threshold can be read back."""
+    inventory = Inventory(milk=2)
+    inventory.set_threshold("milk", 3)
+    assert inventory.threshold("milk") == 3
+    assert inventory.threshold("sugar") is None
+
+
+def test__below_threshold_after_set():
+    """Items below their threshold are reported, items at their threshold are not."""
+    inventory = Inventory(milk=2, sugar=1, flour=5)
+    inventory.set_threshold("milk", 3)
+    inventory.set_threshold("sugar", 1)
+    inventory.set_threshold("flour", 4)
+    assert inventory.below_threshold() == ["milk"]
+
+
+def test__below_threshold_missing_item():
+    """A missing item with a threshold counts as quantity zero."""
+    inventory = Inventory()
+    inventory.set_threshold("milk", 1)
+    assert inventory.below_threshold() == ["milk"]
+
+
+def test__remove_threshold():
+    """Removing a threshold drops the item from the index."""
+    inventory = Inventory(milk=2)
+    inventory.set_threshold("milk", 3)
+    inventory.set_threshold("milk", None)
+    assert inventory.threshold("milk") is None
+    assert inventory.below_threshold() == []
+
+
+def test__override_threshold():
+    """Setting a threshold again replaces the previous one."""
+    inventory = Inventory(milk=2)
+    inventory.set_threshold("milk", 3)
+    inventory.set_threshold("milk", 1)
+    assert inventory.below_threshold() == []
+
+
+def test__below_threshold_follows_updates():
+    """The index follows add, remove, __setitem__ and __delitem__."""
+    inventory = Inventory(milk=5, sugar=5)
+    inventory.set_threshold("milk", 3)
+    inventory.set_threshold("sugar", 2)
+
+    inventory.remove("milk", 3)
+    assert inventory.below_threshold() == ["milk"]
+    inventory.add("milk", 2)
+    assert inventory.below_threshold() == []
+    inventory["sugar"] = 1
+    assert inventory.below_threshold() == ["sugar"]
+    del inventory["milk"]
+    assert inventory.below_threshold() == ["milk", "sugar"]
+
+
+def test__scarcest_ordered_by_margin():
+    """The scarcest items are ordered by quantity minus threshold."""
+    inventory = Inventory(milk=5, sugar=1, flour=10, cheese=2)
+    inventory.set_threshold("milk", 3)
+    inventory.set_threshold("sugar", 2)
+    inventory.set_threshold("flour", 1)
+    assert inventory.scarcest(2) == ["sugar", "milk"]
+    assert inventory.scarcest(5) == ["sugar", "milk", "flour"]
+
+
+def test__callback_on_crossing():
+    """Callbacks are notified when an item falls below and rises back to its threshold."""
+    inventory = Inventory(milk=5)
+    inventory.set_threshold("milk", 3)
+    calls = []
+    inventory.on_threshold(lambda item, quantity, below: calls.append((item, quantity, below)))
+
+    inventory.remove("milk", 3)
+    inventory.add("milk", 3)
+    assert calls == [("milk", 2, True), ("milk", 5, False)]
+
+
+def test__callback_not_without_crossing():
+    """Callbacks are not notified for changes that stay on the same side of the threshold."""
+    inventory = Inventory(milk=5, sugar=1)
+    inventory.set_threshold("milk", 3)
+    calls = []
+    inventory.on_threshold(lambda item, quantity, below: calls.append(item))
+
+    inventory.remove("milk", 1)
+    inventory.add("milk", 4)
+    inventory.add("sugar", 4)
+    inventory.remove("milk", 5)
+    inventory.remove("milk", 1)
+    assert calls == ["milk"]
+
+
+def test__out_of_sync_index_fails_loudly():
+    """A change whose previous margin is not in the index raises instead of dropping another item."""
+    inventory = Inventory(milk=5, sugar=1)
+    inventory.set_threshold("milk", 3)
+    inventory.set_threshold("sugar", 2)
+    inventory._Inventory__inventory["milk"] = 4
+
+    with pytest.raises(RuntimeError):
+        inventory.remove("milk", 1)
+    assert inventory.below_threshold() == ["sugar"]
+
+
+def test__observer_changing_the_inventory():
+    """An observer restocking an item leaves the index of every other item intact."""
+    inventory = Inventory(milk=5, sugar=10, flour=0.5, eggs=4)
+    for item, threshold in {"milk": 3, "sugar": 2, "flour": 1, "eggs": 1}.items():
+        inventory.set_threshold(item, threshold)
+
+    def restock(item, previous, quantity):
+        if item == "milk" and quantity < 3:
+            inventory.add("milk", 10)
+
+    inventory.observe(restock)
+    inventory.remove("milk", 4)
+    assert inventory["milk"] == 11
+    assert inventory.below_threshold() == ["flour"]
+    assert inventory.scarcest(4) == ["flour", "eggs", "milk", "sugar"]
+
+
+def test__observers_see_each_change_once():
+    """Observers after a restocking observer are notified with the quantities of each change."""
+    inventory = Inventory(milk=5)
+    inventory.set_threshold("milk", 3)
+    inventory.observe(lambda item, previous, quantity: quantity < 3 and inventory.add(item, 10))
+    changes = []
+    inventory.observe(lambda item, previous, quantity: changes.append((previous, quantity)))
+
+    inventory.remove("milk", 4)
+    assert sorted(changes) == [(1, 11), (5, 1)]
+    assert inventory.below_threshold() == []
@@ -0,0 +1,140 @@
+"""Unit tests for the PooledInventory class."""
+from pytest import approx
+from inventory_app.inventory import Inventory
+from inventory_app.pooled_inventory import PooledInventory, balanced, drain_smallest, nearest_first
+from inventory_app.recipe import Recipe
+from inventory_app.cooking_service import CookingService
+
+
+def _locations():
+    return {
+        "store": Inventory(milk=1, flour=2),
+        "cellar": Inventory(milk=4, sugar=1),
+        "warehouse": Inventory(milk=2, flour=6),
+    }
+
+
+def test__pooled_totals():
+    """The pooled inventory holds the total of every item over all locations."""
+    pooled = PooledInventory(_locations())
+    assert pooled == {"milk": 7, "flour": 8, "sugar": 1}
+    assert len(pooled) == 3
+    assert pooled["cheese"] == 0
+    assert "sugar" in pooled
+    assert "cheese" not in pooled
+
+
+def test__pooled_totals_follow_locations():
+    """Changes of a location inventory are reflected in the totals."""
+    locations = _locations()
+    pooled = PooledInventory(locations)
+
+    locations["store"].add("milk", 2)
+    locations["cellar"].remove("sugar")
+    locations["warehouse"]["cheese"] = 3
+    assert pooled == {"milk": 9, "flour": 8, "cheese": 3}
+    assert set(pooled.names()) == {"milk", "flour", "cheese"}
+    assert dict(pooled.items()) == {"milk": 9, "flour": 8, "cheese": 3}
+
+
+def test__pooled_totals_drop_removed_items():
+    """An item removed from all locations is not part of the pooled inventory anymore."""
+    locations = {"store": Inventory(sugar=0.1), "cellar": Inventory(sugar=0.2)}
+    pooled = PooledInventory(locations)
+
+    locations["store"].remove("sugar", 0.1)
+    locations["cellar"].remove("sugar", 0.2)
+    assert "sugar" not in pooled
+
+
+def test__close_stops_following():
+    """A closed pooled inventory does not follow the locations anymore."""
+    locations = _locations()
+    with PooledInventory(locations) as pooled:
+        pass
+
+    locations["store"].add("milk", 2)
+    assert pooled["milk"] == 7
+
+
+def test__equals():
+    """Pooled inventories with the same totals are equal."""
+    assert PooledInventory(_locations()) == PooledInventory({"all": Inventory(milk=7, flour=8, sugar=1)})
+    assert PooledInventory(_locations()) != Inventory(milk=7, flour=8, sugar=1)
+
+
+def test__add_to_first_location():
+    """Added items are put into the first location."""
+    pooled = PooledInventory(_locations())
+    pooled.add("cheese", 2)
+    pooled["milk"] = 10
+    assert pooled.location("store") == {"milk": 4, "flour": 2, "cheese": 2}
+    assert pooled == {"milk": 10, "flour": 8, "sugar": 1, "cheese": 2}
+
+
+def test__remove_nearest_first():
+    """By default items are removed from the locations in their given order."""
+    pooled = PooledInventory(_locations())
+    pooled.remove("milk", 3)
+    pooled.add("flour", -3)
+    assert list(pooled.locations()) == ["store", "cellar", "warehouse"]
+    assert pooled.location("store") == {}
+    assert pooled.location("cellar") == {"milk": 2, "sugar": 1}
+    assert pooled.location("warehouse") == {"milk": 2, "flour": 5}
+
+
+def test__remove_everything():
+    """Removing an item without quantity, or more than pooled, removes it from all locations."""
+    pooled = PooledInventory(_locations())
+    del pooled["milk"]
+    pooled.remove("flour", 10)
+    pooled.remove("cheese")
+    assert pooled == {"sugar": 1}
+    assert pooled.location("warehouse") == {}
+
+
+def test__remove_negative():
+    """Removing a negative quantity adds it."""
+    pooled = PooledInventory(_locations())
+    pooled.remove("sugar", -2)
+    assert pooled["sugar"] == 3
+
+
+def test__remove_drain_smallest():
+    """The drain smallest policy empties the locations with the least stock first."""
+    pooled = PooledInventory(_locations(), drain_smallest)
+    pooled.remove("milk", 4)
+    assert pooled.location("store") == {"flour": 2}
+    assert pooled.location("cellar") == {"milk": 3, "sugar": 1}
+    assert pooled.location("warehouse") == {"flour": 6}
+
+
+def test__remove_balanced():
+    """The balanced policy takes from every location in proportion to its stock."""
+    pooled = PooledInventory(_locations(), balanced)
+    pooled.remove("flour", 4)
+    assert pooled.location("store")["flour"] == approx(1)
+    assert pooled.location("warehouse")["flour"] == approx(3)
+    assert pooled["flour"] == approx(4)
+
+
+def test__policies_never_exceed_stock():
+    """Every policy allocates exactly the requested quantity within the stock of each location."""
+    stocks = [("a", 1.0), ("b", 5.0), ("c", 2.0)]
+    for policy in (nearest_first, drain_smallest, balanced):
+        allocation = dict(policy(6, stocks))
+        assert sum(allocation.values()) == approx(6)
+        assert all(allocation[location] <= stock for location, stock in stocks if location in allocation)
+
+
+def test__cook_from_pooled_stock():
+    """The cooking service checks and cooks against the pooled stock of all locations."""
+    pooled = PooledInventory(_locations())
+    cookies = Recipe(portions=2, time=30, milk=6, flour=3, sugar=1)
+
+    cooking_service = CookingService(pooled)
+    assert cooking_service.is_cookable(cookies)
+    cooking_service.cook_recipe(cookies)
+    assert not cooking_service.is_cookable(cookies)
+    assert pooled == {"milk": 1, "flour": 5}
+    assert pooled.location("warehouse") == {"milk": 1, "flour": 5}
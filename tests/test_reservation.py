@@ -0,0 +1,145 @@
+"""Unit tests for the ReservationBook class."""
+from pytest import raises
+from inventory_app.inventory import Inventory
+from inventory_app.reservation import ReservationBook, ReservationError
+
+
+class _Clock:
+    """A clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test__hold_reduces_available_not_on_hand():
+    """A hold reduces the available quantity, but not the quantity on hand."""
+    inventory = Inventory(milk=5, sugar=2)
+    book = ReservationBook(inventory, _Clock())
+    book.hold({"milk": 3}, ttl=10)
+
+    assert book.reserved("milk") == 3
+    assert book.available("milk") == 2
+    assert book.available("sugar") == 2
+    assert inventory == {"milk": 5, "sugar": 2}
+
+
+def test__hold_more_than_available():
+    """Holding more than available is rejected."""
+    book = ReservationBook(Inventory(milk=5), _Clock())
+    book.hold({"milk": 3}, ttl=10)
+    with raises(ReservationError, match="Not enough 'milk' available to reserve 3"):
+        book.hold({"milk": 3}, ttl=10)
+    assert len(book) == 1
+
+
+def test__hold_non_positive_quantity():
+    """Holding a zero or negative quantity is rejected and does not change the available quantity."""
+    book = ReservationBook(Inventory(milk=5), _Clock())
+    with raises(ReservationError, match="Quantity -10 of 'milk' to reserve is not positive"):
+        book.hold({"milk": -10}, ttl=60)
+    with raises(ReservationError, match="Quantity 0 of 'milk' to reserve is not positive"):
+        book.hold({"milk": 0}, ttl=60)
+    assert book.available("milk") == 5
+    assert len(book) == 0
+
+
+def test__commit_removes_from_inventory():
+    """Committing a hold removes its quantities from the inventory."""
+    inventory = Inventory(milk=5, sugar=2)
+    book = ReservationBook(inventory, _Clock())
+    hold = book.hold({"milk": 3, "sugar": 2}, ttl=10)
+    book.commit(hold)
+
+    assert inventory == {"milk": 2}
+    assert book.reserved("milk") == 0
+    assert hold not in book
+
+
+def test__commit_with_stock_used_elsewhere():
+    """Committing fails without removing anything if an item was used outside the book, and the hold stays active."""
+    inventory = Inventory(milk=5, sugar=2)
+    book = ReservationBook(inventory, _Clock())
+    hold = book.hold({"sugar": 1, "milk": 4}, ttl=10)
+    inventory.remove("milk", 3)
+
+    with raises(ReservationError, match="Only 2 'milk' on hand to commit 4 for reservation 1"):
+        book.commit(hold)
+    assert inventory == {"milk": 2, "sugar": 2}
+    assert hold in book
+
+    inventory.add("milk", 2)
+    book.commit(hold)
+    assert inventory == {"sugar": 1}
+
+
+def test__release_keeps_inventory():
+    """Releasing a hold makes its quantities available again."""
+    inventory = Inventory(milk=5)
+    book = ReservationBook(inventory, _Clock())
+    first = book.hold({"milk": 3}, ttl=10)
+    book.hold({"milk": 1}, ttl=10)
+    book.release(first)
+
+    assert inventory == {"milk": 5}
+    assert book.available("milk") == 4
+    assert len(book) == 1
+
+
+def test__expired_hold():
+    """A hold expires after its time to live and cannot be committed anymore."""
+    clock = _Clock()
+    inventory = Inventory(milk=5)
+    book = ReservationBook(inventory, clock)
+    early = book.hold({"milk": 1}, ttl=5)
+    late = book.hold({"milk": 2}, ttl=10)
+
+    clock.now = 5
+    assert book.available("milk") == 3
+    assert early not in book
+    assert late in book
+    with raises(ReservationError, match=f"Reservation {early} is unknown or expired"):
+        book.commit(early)
+
+    clock.now = 10
+    assert book.expire() == [late]
+    assert book.available("milk") == 5
+    assert inventory == {"milk": 5}
+
+
+def test__unknown_hold():
+    """Releasing an unknown or already released hold fails."""
+    book = ReservationBook(Inventory(milk=5), _Clock())
+    hold = book.hold({"milk": 1}, ttl=5)
+    book.release(hold)
+    with raises(ReservationError, match=f"Reservation {hold} is unknown or expired"):
+        book.release(hold)
+
+
+def test__available_never_negative():
+    """Items consumed below their reserved quantity are not available."""
+    inventory = Inventory(milk=5)
+    book = ReservationBook(inventory, _Clock())
+    book.hold({"milk": 4}, ttl=5)
+    inventory.remove("milk", 3)
+    assert book.available("milk") == 0
+
+
+def test__many_holds():
+    """Many holds are released, committed and expired without leftovers."""
+    clock = _Clock()
+    inventory = Inventory(milk=100_000)
+    book = ReservationBook(inventory, clock)
+    holds = [book.hold({"milk": 1}, ttl=i % 100 + 1) for i in range(50_000)]
+    for hold in holds[::2]:
+        book.release(hold)
+    for hold in holds[1:1000:2]:
+        book.commit(hold)
+    assert len(book) == 24_500
+
+    clock.now = 100
+    assert len(book.expire()) == 24_500
+    assert book.reserved("milk") == 0
+    assert inventory == {"milk": 99_500}
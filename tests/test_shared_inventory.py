@@ -0,0 +1,128 @@
+"""Unit tests for the SharedInventory class."""
+import multiprocessing
+import json5
+from pytest import fixture, mark, raises
+from inventory_app.cooking_service import CookingService
+from inventory_app.inventory import Inventory, InventoryLoader, InventorySerializer
+from inventory_app.recipe import Recipe
+from inventory_app.shared_inventory import InventoryCapacityError, SharedInventory
+
+
+@fixture
+def shared():
+    """Provide a shared inventory released after the test."""
+    with SharedInventory.from_inventory(Inventory(milk=3, sugar=1.5)) as inventory:
+        yield inventory
+
+
+def _cook(inventory: SharedInventory, times: int):
+    cookies = Recipe(portions=2, time=30, milk=1, flour=1)
+    for _ in range(times):
+        with inventory.transaction():
+            CookingService(inventory).cook_recipe(cookies)
+    inventory.close()
+
+
+def _restock(inventory: SharedInventory):
+    inventory.add("flour", 100)
+    inventory["eggs"] = 6
+    inventory.close()
+
+
+def test__from_inventory(shared: SharedInventory):
+    """A shared inventory holds the items of the inventory it was created from."""
+    assert shared == {"milk": 3, "sugar": 1.5}
+    assert shared == Inventory(milk=3, sugar=1.5)
+    assert len(shared) == 2
+    assert shared.names() == ["milk", "sugar"]
+
+
+def test__item_access(shared: SharedInventory):
+    """Items are read, assigned, added and removed like in an Inventory."""
+    shared["flour"] = 4
+    shared.add("milk", 2)
+    shared.add("sugar", -0.5)
+    shared.add("eggs", 0)
+    shared.remove("flour", 1)
+    shared.remove("cheese", -1)
+    assert shared == {"milk": 5, "sugar": 1, "flour": 3, "cheese": 1}
+    assert shared["eggs"] == 0
+    assert "eggs" not in shared
+
+
+def test__remove_items(shared: SharedInventory):
+    """Removed items are not part of the inventory anymore."""
+    shared.remove("milk", 5)
+    del shared["sugar"]
+    shared["cheese"] = 0
+    shared.remove("eggs")
+    assert shared == {}
+    assert len(shared) == 0
+    assert "milk" not in shared
+
+
+def test__capacity():
+    """A shared inventory rejects new items when all slots are in use, removed items keep their slot."""
+    with SharedInventory(capacity=1) as inventory:
+        inventory.add("milk")
+        inventory.remove("milk")
+        inventory.add("milk")
+        with raises(InventoryCapacityError, match="has no free slot for item 'sugar'"):
+            inventory.add("sugar")
+
+
+def test__invalid_item_name(shared: SharedInventory):
+    """Item names not fitting into the name table are rejected."""
+    with raises(ValueError, match="is longer than 64 bytes"):
+        shared.add("x" * 65)
+
+
+def test__equals_shared_inventories(shared: SharedInventory):
+    """Shared inventories with the same items are equal."""
+    with SharedInventory.from_inventory(Inventory(milk=3, sugar=1.5)) as other:
+        assert shared == other
+        other.add("milk")
+        assert shared != other
+    assert shared != 3
+
+
+@mark.parametrize("method", ["fork", "spawn"])
+def test__updates_visible_across_processes(method: str):
+    """Updates of another process are visible immediately."""
+    context = multiprocessing.get_context(method)
+    with SharedInventory.from_inventory(Inventory(milk=3), context=context) as shared:
+        process = context.Process(target=_restock, args=(shared,))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        assert shared == {"milk": 3, "flour": 100, "eggs": 6}
+
+
+def test__concurrent_cooking(shared: SharedInventory):
+    """Cooking in several processes at once deducts every recipe exactly once."""
+    shared["milk"] = 100
+    shared["flour"] = 100
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_cook, args=(shared, 20)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert shared == {"milk": 20, "flour": 20, "sugar": 1.5}
+
+
+def test__snapshot(shared: SharedInventory):
+    """A snapshot is saved in the json5 inventory format."""
+    shared.snapshot(InventoryLoader("tests/tmp/shared", InventorySerializer()))
+    with open("tests/tmp/shared.json5", 'r', encoding="utf-8") as file:
+        assert json5.load(file) == {"milk": 3, "sugar": 1.5}
+
+
+def test__periodic_snapshots(shared: SharedInventory):
+    """Periodic snapshots save the latest state, at the latest when they are stopped."""
+    loader = InventoryLoader("tests/tmp/shared_periodic", InventorySerializer())
+    shared.start_snapshots(loader, 60)
+    shared.start_snapshots(loader, 0.01)
+    shared.add("milk")
+    shared.stop_snapshots()
+    assert loader.load_inventory() == {"milk": 4, "sugar": 1.5}
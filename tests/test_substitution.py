@@ -0,0 +1,194 @@
+"""Unit tests for the SubstitutionCatalog class."""
+import random
+from pytest import approx, raises
+from inventory_app.substitution import SubstitutionCatalog
+
+
+def test__no_substitutes():
+    """An ingredient without rules has no substitutes."""
+    catalog = SubstitutionCatalog()
+    assert catalog.substitutes("butter") == []
+    assert len(catalog) == 0
+
+
+def test__direct_substitutes_cheapest_first():
+    """Direct substitutes are returned with their ratio, smallest ratio first."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("oil", "butter", 0.8)
+    catalog.add_rule("margarine", "butter")
+    catalog.add_rule("ghee", "butter", 0.7)
+    assert catalog.substitutes("butter") == [("ghee", 0.7), ("oil", 0.8), ("margarine", 1)]
+    assert len(catalog) == 3
+
+
+def test__transitive_substitutes():
+    """Substitutes of substitutes are resolved with the product of the ratios along the cheapest path."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("margarine", "butter", 1.0)
+    catalog.add_rule("oil", "margarine", 0.8)
+    catalog.add_rule("oil", "butter", 0.9)
+    catalog.add_rule("butter", "oil", 1.25)
+    assert catalog.substitutes("butter") == [("oil", approx(0.8)), ("margarine", 1.0)]
+    assert catalog.substitutes("oil") == [("butter", 1.25), ("margarine", 1.25)]
+
+
+def test__add_rule_invalidates_dependent_resolutions():
+    """Adding a rule updates the substitutes of every ingredient resolving through it."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("margarine", "butter")
+    catalog.add_rule("cream", "milk")
+    assert catalog.substitutes("butter") == [("margarine", 1)]
+    assert catalog.substitutes("milk") == [("cream", 1)]
+
+    catalog.add_rule("oil", "margarine", 0.8)
+    assert catalog.substitutes("butter") == [("oil", 0.8), ("margarine", 1)]
+    assert catalog.substitutes("milk") == [("cream", 1)]
+
+
+def test__replace_rule():
+    """Adding an existing rule again replaces its ratio."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("margarine", "butter")
+    assert catalog.substitutes("butter") == [("margarine", 1)]
+    catalog.add_rule("margarine", "butter", 1.5)
+    assert catalog.substitutes("butter") == [("margarine", 1.5)]
+
+
+def test__remove_rule_invalidates_dependent_resolutions():
+    """Removing a rule updates the substitutes of every ingredient resolving through it."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("margarine", "butter")
+    catalog.add_rule("oil", "margarine", 0.8)
+    assert catalog.substitutes("butter") == [("oil", 0.8), ("margarine", 1)]
+    assert catalog.substitutes("margarine") == [("oil", 0.8)]
+
+    catalog.remove_rule("oil", "margarine")
+    catalog.remove_rule("oil", "margarine")
+    assert catalog.substitutes("butter") == [("margarine", 1)]
+    assert catalog.substitutes("margarine") == []
+
+
+def test__invalid_rules():
+    """Rules with non positive ratios or substituting an ingredient by itself are rejected."""
+    catalog = SubstitutionCatalog()
+    with raises(ValueError, match="Substitution ratio 0 is not positive"):
+        catalog.add_rule("margarine", "butter", 0)
+    with raises(ValueError, match="Ingredient 'butter' cannot substitute itself"):
+        catalog.add_rule("butter", "butter")
+
+
+def test__large_catalogue():
+    """A chain of thousands of rules is resolved and invalidated correctly."""
+    catalog = SubstitutionCatalog()
+    for i in range(2000):
+        catalog.add_rule(f"item{i + 1}", f"item{i}")
+    assert len(catalog.substitutes("item0")) == 2000
+    assert len(catalog.substitutes("item1999")) == 1
+
+    catalog.remove_rule("item1000", "item999")
+    assert len(catalog.substitutes("item0")) == 999
+    assert len(catalog.substitutes("item1999")) == 1
+
+
+def test__cycle_reducing_ratio_rejected():
+    """A rule closing a cycle whose ratios multiply to less than 1 is rejected and leaves the catalogue unchanged."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("margarine", "butter", 1.0)
+    catalog.add_rule("oil", "margarine", 0.8)
+    with raises(ValueError, match="Rule 'margarine' for 'oil' closes a cycle with ratio 0.64"):
+        catalog.add_rule("margarine", "oil", 0.8)
+
+    assert len(catalog) == 2
+    assert catalog.substitutes("butter") == [("oil", approx(0.8)), ("margarine", 1.0)]
+
+
+def test__cycle_keeping_ratio_allowed():
+    """Cycles whose ratios multiply to at least 1 are allowed and do not reduce any ratio."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("margarine", "butter", 0.8)
+    catalog.add_rule("butter", "margarine", 1.25)
+    catalog.add_rule("oil", "margarine", 2)
+    catalog.add_rule("margarine", "oil", 0.5)
+    assert catalog.substitutes("butter") == [("margarine", 0.8), ("oil", approx(1.6))]
+    assert catalog.substitutes("oil") == [("margarine", 0.5), ("butter", approx(0.625))]
+
+
+def test__changes_keep_unaffected_resolutions():
+    """Only resolutions whose cheapest substitutes use a changed rule or get cheaper through it are resolved again."""
+    catalog = SubstitutionCatalog()
+    catalog.add_rule("margarine", "butter", 1.0)
+    catalog.add_rule("oil", "margarine", 0.8)
+    catalog.add_rule("oil", "lard", 0.5)
+    butter, lard = catalog.substitutes("butter"), catalog.substitutes("lard")
+
+    catalog.add_rule("oil", "butter", 0.9)
+    assert catalog.substitutes("butter") is butter
+    catalog.add_rule("oil", "butter", 0.7)
+    assert catalog.substitutes("butter") == [("oil", 0.7), ("margarine", 1.0)]
+    catalog.remove_rule("oil", "margarine")
+    assert catalog.substitutes("margarine") == []
+    assert catalog.substitutes("lard") is lard
+
+
+def _cheapest(rules: dict[tuple[str, str], float], original: str) -> dict[str, float]:
+    """Resolve the cheapest ratios by Bellman-Ford, as a reference."""
+    ratios = {original: 1.0}
+    for _ in range(len(rules)):
+        for (substitute, replaced), ratio in rules.items():
+            if replaced in ratios and ratios[replaced] * ratio < ratios.get(substitute, float("inf")):
+                ratios[substitute] = ratios[replaced] * ratio
+    del ratios[original]
+    return ratios
+
+
+def test__random_catalogue_resolves_cheapest_paths():
+    """The substitutes of a random catalogue with cycles match the cheapest paths, unaffected by unrelated rules."""
+    rng = random.Random(42)
+    catalog = SubstitutionCatalog()
+    rules = {}
+    for _ in range(300):
+        substitute, original = rng.sample([f"item{i}" for i in range(60)], 2)
+        ratio = rng.uniform(0.5, 2)
+        try:
+            catalog.add_rule(substitute, original, ratio)
+            rules[(substitute, original)] = ratio
+        except ValueError:
+            pass
+
+    for i in range(60):
+        assert dict(catalog.substitutes(f"item{i}")) == approx(_cheapest(rules, f"item{i}"))
+
+    expected = catalog.substitutes("item0")
+    for i in range(100):
+        catalog.add_rule(f"unrelated{i + 1}", f"unrelated{i}", 0.5)
+    assert catalog.substitutes("item0") is expected
+
+
+def test__random_changes_match_fresh_catalogue():
+    """Adding and removing random rules keeps every cached resolution equal to a freshly built catalogue."""
+    rng = random.Random(7)
+    items = [f"item{i}" for i in range(40)]
+    catalog = SubstitutionCatalog()
+    rules = {}
+    for step in range(600):
+        substitute, original = rng.sample(items, 2)
+        if (substitute, original) in rules and rng.random() < 0.3:
+            catalog.remove_rule(substitute, original)
+            del rules[(substitute, original)]
+        else:
+            ratio = rng.uniform(0.5, 2)
+            try:
+                catalog.add_rule(substitute, original, ratio)
+                rules[(substitute, original)] = ratio
+            except ValueError:
+                pass
+        if step % 20 == 0:
+            for item in rng.sample(items, 5):
+                catalog.substitutes(item)
+
+    fresh = SubstitutionCatalog()
+    for (substitute, original), ratio in rules.items():
+        fresh.add_rule(substitute, original, ratio)
+    for item in items:
+        assert dict(catalog.substitutes(item)) == approx(dict(fresh.substitutes(item)))
+        assert dict(catalog.substitutes(item)) == approx(_cheapest(rules, item))